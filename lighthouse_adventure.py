@@ -8,14 +8,31 @@ A ghostly lighthouse looms above, its light extinguished for centuries.
 Restore the light and free the trapped souls to escape this cursed place.
 """
 
-import pygame
+import argparse
+import os
 import sys
 import textwrap
 import random
 import math
+import functools
+import hashlib
+import heapq
+import importlib.util
+import itertools
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
+
+# The game prints its own banner, and scripted output must stay clean
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 
-# Initialize Pygame
-pygame.init()
+import pygame
 
 # EGA Color Palette (16 colors)
 EGA_COLORS = {
@@ -37,6 +54,40 @@ EGA_COLORS = {
     'white': (255, 255, 255)
 }
 
+# Palette-cycled colors. In indexed mode each one gets its own palette slot
+# whose RGB value steps through the cycle, so the effect animates without
+# repainting anything; in RGB mode it is drawn as the first color of its
+# cycle.
+COLOR_CYCLES = {
+    'shimmer': ('light_cyan', 'cyan', 'light_blue', 'cyan'),  # waves
+    'glow': ('cyan', 'light_cyan', 'light_cyan', 'cyan'),  # cave algae
+    'glow_alt': ('light_cyan', 'cyan', 'cyan', 'light_cyan'),
+    'beam': ('yellow', 'yellow', 'white', 'yellow'),  # lighthouse light
+}
+CYCLE_RATE = 4
+
+# Rooms whose pictures use cycled colors
+CYCLED_ROOMS = {'beach', 'cave', 'lighthouse_exterior'}
+
+# Color key for transparent sprite pixels, not an EGA color
+CLEAR_COLOR = (1, 2, 3)
+
+# Indexed mode palette: the 16 EGA colors, the cycled slots, then clear
+PALETTE = list(EGA_COLORS) + list(COLOR_CYCLES) + ['clear']
+PALETTE_INDEX = {name: i for i, name in enumerate(PALETTE)}
+
+# RGB value of every color name in RGB mode
+COLORS = dict(EGA_COLORS)
+COLORS.update({name: EGA_COLORS[cycle[0]] for name, cycle in COLOR_CYCLES.items()})
+COLORS['clear'] = CLEAR_COLOR
+
+def palette_at(step):
+    """The indexed mode palette at a step of the color cycles"""
+    palette = list(EGA_COLORS.values())
+    palette += [EGA_COLORS[cycle[step % len(cycle)]] for cycle in COLOR_CYCLES.values()]
+    palette.append(CLEAR_COLOR)
+    return palette
+
 # Screen setup (EGA-style 320x200 scaled up)
 SCALE = 3
 GAME_WIDTH = 320
@@ -44,626 +95,1217 @@ GAME_HEIGHT = 200
 SCREEN_WIDTH = GAME_WIDTH * SCALE
 SCREEN_HEIGHT = GAME_HEIGHT * SCALE
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("The Lighthouse of Forgotten Souls")
-game_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+# Display and fonts are created by init_display(), not at import time, so
+# tools that only need the parser or the room data never touch SDL video
+screen = None
+presenter = None
+game_surface = None
+font_small = None
+font_medium = None
+indexed_color = False
+
+def init_display(headless=False, scale_mode='integer', scale=SCALE, upscaler=None, indexed=False):
+    """Set up the window, game surface and fonts
+
+    In headless mode no window is opened and no video device is needed:
+    frames are rendered to the offscreen game surface only. Otherwise
+    scale_mode, scale and upscaler choose how the Presenter puts the game
+    surface on the display. With indexed, the game surface is 8-bit with
+    the EGA palette and cycled colors animate through palette changes.
+    """
+    global presenter, game_surface, font_small, font_medium, indexed_color
+
+    indexed_color = indexed
+    if indexed:
+        game_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), 0, 8)
+        game_surface.set_palette(palette_at(0))
+    else:
+        game_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+
+    if headless:
+        presenter = None
+    else:
+        pygame.init()
+        pygame.display.set_caption("The Lighthouse of Forgotten Souls")
+        presenter = Presenter(scale_mode, scale, upscaler)
+
+    # Fonts
+    pygame.font.init()
+    font_small = pygame.font.Font(None, 16)
+    font_medium = pygame.font.Font(None, 20)
+    return game_surface
+
+# Every flag the game tracks; each one is a bit of GameState.flag_bits
+FLAGS = (
+    'talked_to_ghost',
+    'lighthouse_door_open',
+    'lantern_lit',
+    'mirror_placed',
+    'lens_installed',
+    'lighthouse_lit',
+    'crab_moved',
+    'found_secret_cave',
+    'read_journal',
+    'bell_rung',
+    'game_won',
+)
+FLAG_BITS = {flag: 1 << i for i, flag in enumerate(FLAGS)}
+
+class FlagsView(MutableMapping):
+    """Dict-style access to a GameState's flag bits"""
+    __slots__ = ('state',)
+
+    def __init__(self, state):
+        self.state = state
+
+    def __getitem__(self, flag):
+        return bool(self.state.flag_bits & FLAG_BITS[flag])
+
+    def __setitem__(self, flag, value):
+        if value:
+            self.state.flag_bits |= FLAG_BITS[flag]
+        else:
+            self.state.flag_bits &= ~FLAG_BITS[flag]
 
-# Fonts
-pygame.font.init()
-font_small = pygame.font.Font(None, 16)
-font_medium = pygame.font.Font(None, 20)
+    def __delitem__(self, flag):
+        raise TypeError("flags can be cleared but not removed")
+
+    def __iter__(self):
+        return iter(FLAGS)
+
+    def __len__(self):
+        return len(FLAGS)
 
 class GameState:
+    """One player's progress, packed into a handful of ints
+
+    Inventory and flags are bitsets over ITEMS and FLAGS. The flags
+    attribute is a view over its bits; inventory is a tuple of the carried
+    items in the order they were picked up, kept as ITEMS indexes beside
+    the bits. Items whose bits were set directly, as the solver and
+    from_key() do, follow in registry order.
+    """
+    __slots__ = ('current_room', 'inventory_bits', 'pickup_order', 'flag_bits', 'message', 'message_timer',
+                 'world')
+
     def __init__(self):
         self.current_room = "beach"
-        self.inventory = []
-        self.flags = {
-            'talked_to_ghost': False,
-            'lighthouse_door_open': False,
-            'lantern_lit': False,
-            'mirror_placed': False,
-            'lens_installed': False,
-            'lighthouse_lit': False,
-            'crab_moved': False,
-            'found_secret_cave': False,
-            'read_journal': False,
-            'bell_rung': False,
-            'game_won': False
-        }
+        self.inventory_bits = 0
+        self.pickup_order = ()
+        self.flag_bits = 0
         self.message = "You awaken on a cold, misty beach. Waves crash nearby. A dark lighthouse looms to the north."
         self.message_timer = 0
+        # Rooms are shared and read-only; this player's changes live here
+        self.world = WorldState()
+
+    @property
+    def inventory(self):
+        bits = self.inventory_bits
+        items = tuple(ITEMS[index] for index in self.pickup_order if bits >> index & 1)
+        if len(items) != bin(bits).count('1'):
+            items += tuple(item for item, bit in ITEM_BITS.items() if bits & bit and item not in items)
+        return items
+
+    @inventory.setter
+    def inventory(self, items):
+        self.inventory_bits = 0
+        self.pickup_order = ()
+        for item in items:
+            self.add_to_inventory(item)
+
+    @property
+    def flags(self):
+        return FlagsView(self)
+
+    @flags.setter
+    def flags(self, values):
+        self.flag_bits = 0
+        self.flags.update(values)
 
     def add_to_inventory(self, item):
-        if item not in self.inventory:
-            self.inventory.append(item)
-            return True
-        return False
+        bit = ITEM_BITS[item]
+        if self.inventory_bits & bit:
+            return False
+        self.inventory_bits |= bit
+        index = ITEM_INDEX[item]
+        self.pickup_order = tuple(i for i in self.pickup_order if i != index) + (index,)
+        return True
 
     def has_item(self, item):
-        return item in self.inventory
+        return bool(self.inventory_bits & ITEM_BITS.get(item, 0))
 
     def remove_item(self, item):
-        if item in self.inventory:
-            self.inventory.remove(item)
+        if self.has_item(item):
+            self.inventory_bits &= ~ITEM_BITS[item]
             return True
         return False
 
-# Room definitions
-ROOMS = {
-    'beach': {
-        'name': 'Shipwreck Beach',
-        'description': 'A desolate beach littered with driftwood and ship debris. The skeleton of your ship lies half-buried in sand. To the north, a worn path leads uphill toward a lighthouse. Rocky cliffs stretch east.',
-        'exits': {'north': 'path', 'east': 'cliffs'},
-        'items': ['driftwood', 'rope'],
-        'examine': {
-            'ship': 'The wreckage of the "Maiden\'s Hope". Your crew... you hope they made it somewhere safe.',
-            'driftwood': 'Weathered wood from countless shipwrecks. One piece looks sturdy enough to use.',
-            'rope': 'A length of good rope, still strong despite the saltwater.',
-            'sand': 'Cold, gray sand. Something glints beneath the surface near the waterline.',
-            'water': 'The sea churns endlessly, gray and unforgiving.'
-        }
-    },
-    'cliffs': {
-        'name': 'Rocky Cliffs',
-        'description': 'Jagged cliffs overlook the churning sea. A narrow ledge leads to a cave entrance, but a large aggressive crab blocks the way. Seagulls cry overhead.',
-        'exits': {'west': 'beach', 'north': 'cave'},
-        'items': [],
-        'examine': {
-            'crab': 'A massive red crab with claws that could snap bone. It snaps menacingly when you approach the cave.',
-            'cave': 'A dark opening in the cliff face. You can\'t reach it with that crab there.',
-            'ledge': 'A narrow ledge, slippery with sea spray.',
-            'seagulls': 'They wheel and cry, as if warning you of something.'
-        }
-    },
-    'cave': {
-        'name': 'Sea Cave',
-        'description': 'A damp cave filled with the sound of dripping water. Bioluminescent algae casts an eerie blue-green glow. Ancient carvings cover the walls.',
-        'exits': {'south': 'cliffs'},
-        'items': ['crystal_lens', 'ancient_coin'],
-        'examine': {
-            'carvings': 'Spiraling symbols and images of a lighthouse with souls rising from it. One phrase is readable: "LIGHT REUNITES WHAT DARKNESS DIVIDES"',
-            'algae': 'Strange glowing algae. It pulses gently, almost like breathing.',
-            'crystal_lens': 'A perfectly shaped crystal lens, clearly crafted by skilled hands. It must be for the lighthouse!',
-            'ancient_coin': 'An old coin bearing the image of a lighthouse keeper.',
-            'water': 'A small pool of seawater. Something shimmers at the bottom.'
-        }
-    },
-    'path': {
-        'name': 'Winding Path',
-        'description': 'A weathered stone path winds up the hillside. Wild roses grow alongside, their sweet scent mixing with sea salt. A ghostly figure stands near a crumbling well.',
-        'exits': {'south': 'beach', 'north': 'lighthouse_exterior', 'east': 'garden'},
-        'items': [],
-        'examine': {
-            'ghost': 'A translucent woman in old-fashioned dress. She gazes toward the lighthouse with profound sadness.',
-            'well': 'An old stone well. A rusty bucket hangs from a frayed rope. You hear water far below.',
-            'roses': 'Beautiful wild roses. Their thorns are sharp.',
-            'path': 'Worn smooth by countless footsteps over the centuries.'
-        }
-    },
-    'garden': {
-        'name': 'Overgrown Garden',
-        'description': 'What was once a lovely garden is now wild and overgrown. A stone bench sits beneath a gnarled apple tree. An old shed stands nearby, its door hanging open.',
-        'exits': {'west': 'path', 'north': 'shed'},
-        'items': ['matches', 'apple'],
-        'examine': {
-            'bench': 'Carved with two names: "ELIZA & THOMAS - FOREVER"',
-            'tree': 'A twisted apple tree. A few withered apples still cling to its branches.',
-            'apple': 'A small apple, surprisingly fresh.',
-            'shed': 'A weathered tool shed. The door creaks ominously.',
-            'flowers': 'Flowers long gone wild, but still beautiful in their chaos.'
-        }
-    },
-    'shed': {
-        'name': 'Garden Shed',
-        'description': 'A dusty shed filled with old tools and forgotten things. Cobwebs drape everything. A workbench holds various items.',
-        'exits': {'south': 'garden'},
-        'items': ['oil_can', 'small_key'],
-        'examine': {
-            'tools': 'Rusty gardening tools hang on the wall.',
-            'workbench': 'A sturdy workbench. An oil can and a small key rest on its surface.',
-            'oil_can': 'A can of lamp oil, still half full after all these years.',
-            'small_key': 'A small brass key with a lighthouse emblem.',
-            'cobwebs': 'Thick cobwebs everywhere. This place hasn\'t been used in ages.'
-        }
-    },
-    'lighthouse_exterior': {
-        'name': 'Lighthouse Base',
-        'description': 'You stand before the imposing lighthouse. Its white-washed walls are cracked and weathered. A heavy iron door blocks the entrance. A bronze bell hangs in a small tower nearby.',
-        'exits': {'south': 'path', 'north': 'lighthouse_interior'},
-        'items': [],
-        'examine': {
-            'door': 'A heavy iron door, locked tight. There\'s a small keyhole.',
-            'lighthouse': 'The lighthouse rises high above, its dark windows like hollow eyes. The light chamber at the top is dark.',
-            'bell': 'An old bronze bell, green with patina. A pull rope dangles from it.',
-            'walls': 'Cracks spider across the walls. Names and dates are carved here - lighthouse keepers of old.'
-        }
-    },
-    'lighthouse_interior': {
-        'name': 'Lighthouse Interior',
-        'description': 'The ground floor of the lighthouse. A spiral staircase winds upward into darkness. An old desk holds a dusty journal. A lantern hangs on a hook by the stairs.',
-        'exits': {'south': 'lighthouse_exterior', 'up': 'lighthouse_stairs'},
-        'items': ['lantern', 'journal'],
-        'examine': {
-            'staircase': 'Iron stairs spiral upward. They look sturdy enough.',
-            'desk': 'An old keeper\'s desk. A journal lies open upon it.',
-            'journal': 'The journal of Thomas Blackwood, lighthouse keeper. The final entry reads: "The storm took my Eliza. I will keep the light burning until she returns. I will wait forever if I must."',
-            'lantern': 'An old brass lantern. It needs oil to work.',
-            'photographs': 'Faded photographs on the wall show a happy couple - the keeper and his wife.'
-        }
-    },
-    'lighthouse_stairs': {
-        'name': 'Spiral Staircase',
-        'description': 'You climb the winding stairs. Windows offer glimpses of the island below. The steps groan under your weight. Almost to the top...',
-        'exits': {'down': 'lighthouse_interior', 'up': 'light_chamber'},
-        'items': [],
-        'examine': {
-            'windows': 'Small windows look out over the island. You can see the beach where you washed ashore.',
-            'stairs': 'Iron stairs, rusty but holding.',
-            'walls': 'More names carved here. Keepers marking their time.'
-        }
-    },
-    'light_chamber': {
-        'name': 'Light Chamber',
-        'description': 'The top of the lighthouse. A massive Fresnel lens housing stands in the center, but the main lens is missing. Mirrors surround the chamber to amplify the light. One mirror bracket is empty.',
-        'exits': {'down': 'lighthouse_stairs'},
-        'items': [],
-        'examine': {
-            'lens_housing': 'The great lens housing. A crystal lens would fit perfectly in the center mount.',
-            'mirrors': 'Arrangement of mirrors to cast the light far across the sea. One bracket is empty.',
-            'bracket': 'An empty bracket where a mirror should be.',
-            'view': 'From here you can see the entire island... and countless ghostly ships on the horizon, waiting.',
-            'mechanism': 'The turning mechanism for the light. It seems functional if only there was light.'
-        }
-    }
-}
+    def state_key(self):
+        """Hashable summary of everything that affects play"""
+        return (self.current_room, self.inventory_bits, self.flag_bits, self.world.taken)
+
+    @classmethod
+    def from_key(cls, key):
+        """Rebuild a state from state_key()"""
+        state = cls()
+        state.current_room, state.inventory_bits, state.flag_bits, state.world.taken = key
+        return state
+
+class WorldState:
+    """One player's changes layered over the shared, read-only ROOMS
+
+    Only deltas are stored, so a session costs memory in proportion to what
+    the player has changed rather than to the size of the world.
+    """
+    __slots__ = ('taken',)
+
+    def __init__(self):
+        # Bitset over ITEMS of everything taken from its room. An item lies
+        # in at most one room, so one int covers the whole world.
+        self.taken = 0
+
+    def has_item(self, room_id, item):
+        return item in ROOMS[room_id]['items'] and not self.taken & ITEM_BITS[item]
+
+    def take_item(self, room_id, item):
+        """Remove an item from a room for this player only"""
+        if not self.has_item(room_id, item):
+            return False
+        self.taken |= ITEM_BITS[item]
+        return True
+
+def freeze(value):
+    """Make room data read-only so every session can share it"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+# Room data
+#
+# Each room is a file in rooms/ defining ROOM: its text, exits, items,
+# examine table and scene. Startup reads only rooms/index.json, the room
+# list and item registry. A room is loaded when first needed, the
+# neighbours of the room being entered are read ahead on a background
+# thread, and a bounded LRU evicts cold rooms along with everything
+# rendered from them, so startup time and memory stay flat however large
+# the world grows.
+
+ROOMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rooms')
+ROOM_CACHE_SIZE = 64
+
+class RoomStore(Mapping):
+    """Read-only room data by id, loaded from a rooms directory on demand
+
+    Every room in the index is a key whether or not it is loaded yet. The
+    LRU is only touched by the thread using the store; the prefetch thread
+    just leaves rooms in prefetched for it to pick up.
+    """
+    def __init__(self, directory, room_ids, capacity=ROOM_CACHE_SIZE):
+        self.directory = directory
+        self.room_ids = tuple(room_ids)
+        self.known = frozenset(self.room_ids)
+        self.capacity = capacity
+        self.loaded = OrderedDict()
+        self.prefetched = {}
+        self.lock = threading.Lock()   # guards prefetched
+        self.requests = None           # prefetch thread's queue, once started
+
+    def __getitem__(self, room_id):
+        room = self.loaded.get(room_id)
+        if room is not None:
+            self.loaded.move_to_end(room_id)
+            return room
+        if room_id not in self.known:
+            raise KeyError(room_id)
+        with self.lock:
+            room = self.prefetched.pop(room_id, None)
+        if room is None:
+            room = self.read(room_id)
+        self.loaded[room_id] = room
+        while len(self.loaded) > self.capacity:
+            forget_room(self.loaded.popitem(last=False)[0])
+        return room
+
+    def __contains__(self, room_id):
+        return room_id in self.known
+
+    def __iter__(self):
+        return iter(self.room_ids)
+
+    def __len__(self):
+        return len(self.room_ids)
+
+    def read(self, room_id):
+        """Load and check one room file"""
+        path = os.path.join(self.directory, room_id + '.py')
+        spec = importlib.util.spec_from_file_location(f"rooms.{room_id}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        check_room(room_id, module.ROOM)
+        return freeze(module.ROOM)
+
+    def enter(self, room_id):
+        """Look up the room being entered and read its neighbours ahead"""
+        room = self[room_id]
+        exits = room['exits'].values()
+        wanted = [exit for exit in exits if exit not in self.loaded]
+        if not wanted and not self.prefetched:
+            return room
+        with self.lock:
+            # Read-ahead for rooms the player walked away from is dropped
+            for stale in self.prefetched.keys() - set(exits):
+                del self.prefetched[stale]
+            wanted = [exit for exit in wanted if exit not in self.prefetched]
+        if wanted:
+            if self.requests is None:
+                self.requests = queue.SimpleQueue()
+                threading.Thread(target=self.prefetch_loop, name='room-prefetch', daemon=True).start()
+            for exit in wanted:
+                self.requests.put(exit)
+        return room
+
+    def prefetch_loop(self):
+        while True:
+            room_id = self.requests.get()
+            if room_id in self.loaded:
+                continue
+            try:
+                room = self.read(room_id)
+            except Exception:
+                # A broken room is reported when it is actually entered
+                continue
+            with self.lock:
+                self.prefetched[room_id] = room
+
+def check_room(room_id, room):
+    """Reject room data the item registry or the parser can't handle"""
+    for item in room['items']:
+        if item not in ITEM_BITS:
+            raise ValueError(f"room {room_id!r}: item {item!r} is missing from rooms/index.json")
+    for key in list(room.get('examine', {})) + list(room['items']):
+        if key in ITEM_ALIASES:
+            raise ValueError(f"room {room_id!r}: alias {key!r} shadows a room noun")
+    for direction in room.get('doors', {}):
+        if direction not in room['exits']:
+            raise ValueError(f"room {room_id!r}: door {direction!r} is not an exit")
+    for key in scene_objects(room.get('scene', ())):
+        if key not in room.get('examine', {}) and key not in room['items']:
+            raise ValueError(f"room {room_id!r}: scene object {key!r} is not an examine or item key")
+    for direction, target in room['exits'].items():
+        if target not in ROOMS:
+            raise ValueError(f"room {room_id!r}: {direction} leads to unknown room {target!r}")
+
+with open(os.path.join(ROOMS_DIR, 'index.json')) as f:
+    WORLD_INDEX = json.load(f)
+
+ROOMS = RoomStore(ROOMS_DIR, WORLD_INDEX['rooms'])
+
+# Interned item registry: everything lying in a room, then items that only
+# turn up through actions. Inventories and world overlays are bitsets over
+# it, so new items are appended to keep existing bits stable.
+ITEMS = tuple(WORLD_INDEX['items'])
+ITEM_INDEX = {item: i for i, item in enumerate(ITEMS)}
+ITEM_BITS = {item: 1 << i for i, item in enumerate(ITEMS)}
+
+def new_surface(size, like):
+    """Make a surface in the same format as another, palette included"""
+    surface = pygame.Surface(size, 0, like)
+    if like.get_bitsize() == 8:
+        surface.set_palette(like.get_palette())
+    return surface
+
+def color_value(surface, color):
+    """A named color as a palette index on 8-bit surfaces, RGB otherwise"""
+    if surface.get_bitsize() == 8:
+        return PALETTE_INDEX[color]
+    return COLORS[color]
+
+def draw_pixel(surface, color, x, y):
+    """Plot a single pixel with an EGA color"""
+    surface.set_at((x, y), color_value(surface, color))
 
 def draw_pixel_rect(surface, color, x, y, w, h):
     """Draw a rectangle with EGA colors"""
-    pygame.draw.rect(surface, EGA_COLORS[color], (x, y, w, h))
+    pygame.draw.rect(surface, color_value(surface, color), (x, y, w, h))
+
+# Pre-tiled checkerboard surfaces keyed by (color1, color2). Each tile covers
+# the whole target surface so a dithered rect is a single blit of the matching
+# area, and the (x + y) parity of every pixel lines up with the screen.
+_dither_tiles = {}
+
+def get_dither_tile(color1, color2, surface):
+    """Return a checkerboard in surface's format, at least as big as it"""
+    size = surface.get_size()
+    key = (color1, color2, surface.get_bitsize())
+    tile = _dither_tiles.get(key)
+    if tile is None or tile.get_width() < size[0] or tile.get_height() < size[1]:
+        tile = new_surface(size, surface)
+        tile.fill(color_value(tile, color2))
+        pixels = pygame.PixelArray(tile)
+        pixels[0::2, 0::2] = color_value(tile, color1)
+        pixels[1::2, 1::2] = color_value(tile, color1)
+        pixels.close()
+        _dither_tiles[key] = tile
+    return tile
 
 def draw_dithered_rect(surface, color1, color2, x, y, w, h):
     """Draw a dithered rectangle for EGA-style gradients"""
-    for py in range(y, y + h):
-        for px in range(x, x + w):
-            if (px + py) % 2 == 0:
-                surface.set_at((px, py), EGA_COLORS[color1])
-            else:
-                surface.set_at((px, py), EGA_COLORS[color2])
-
-def draw_beach(surface, state):
-    """Draw the beach scene"""
-    # Sky gradient (dithered)
-    draw_dithered_rect(surface, 'dark_gray', 'blue', 0, 0, 320, 60)
-    draw_pixel_rect(surface, 'dark_gray', 0, 60, 320, 20)
-
-    # Sea
-    draw_dithered_rect(surface, 'blue', 'dark_gray', 0, 80, 320, 30)
-    draw_pixel_rect(surface, 'blue', 0, 110, 320, 10)
-
-    # Beach
-    draw_dithered_rect(surface, 'brown', 'yellow', 0, 120, 320, 30)
-    draw_pixel_rect(surface, 'brown', 0, 150, 320, 10)
-
-    # Shipwreck
-    draw_pixel_rect(surface, 'brown', 180, 125, 60, 25)
-    draw_pixel_rect(surface, 'brown', 200, 110, 8, 20)  # Mast
-    pygame.draw.polygon(surface, EGA_COLORS['light_gray'], [(200, 110), (240, 120), (200, 125)])  # Torn sail
-
-    # Driftwood
-    if 'driftwood' not in state.inventory:
-        draw_pixel_rect(surface, 'brown', 50, 140, 25, 5)
-        draw_pixel_rect(surface, 'brown', 55, 138, 15, 3)
-
-    # Rope
-    if 'rope' not in state.inventory:
-        for i in range(8):
-            draw_pixel_rect(surface, 'yellow', 100 + i*3, 142 + (i%2)*2, 3, 2)
-
-    # Lighthouse in distance
-    draw_pixel_rect(surface, 'light_gray', 150, 20, 20, 60)
-    draw_pixel_rect(surface, 'red', 150, 20, 20, 10)
-    draw_pixel_rect(surface, 'dark_gray', 155, 10, 10, 10)  # Light chamber
-
-    # Waves
-    for i in range(0, 320, 20):
-        pygame.draw.arc(surface, EGA_COLORS['light_cyan'], (i, 105, 20, 10), 0, 3.14, 1)
-
-    # Mist effect
-    for i in range(0, 320, 40):
-        draw_dithered_rect(surface, 'light_gray', 'dark_gray', i, 70 + (i%20), 30, 5)
-
-def draw_cliffs(surface, state):
-    """Draw the cliffs scene"""
-    # Sky
-    draw_dithered_rect(surface, 'dark_gray', 'blue', 0, 0, 320, 50)
-
-    # Sea below
-    draw_pixel_rect(surface, 'blue', 0, 120, 320, 40)
-    draw_dithered_rect(surface, 'blue', 'light_blue', 0, 140, 320, 20)
-
-    # Cliffs
-    draw_pixel_rect(surface, 'dark_gray', 0, 50, 320, 70)
-    draw_dithered_rect(surface, 'dark_gray', 'brown', 0, 80, 320, 40)
-
-    # Cliff details
-    for i in range(0, 320, 30):
-        h = 20 + (i % 15)
-        draw_pixel_rect(surface, 'brown', i, 60, 25, h)
-
-    # Cave entrance
-    draw_pixel_rect(surface, 'black', 200, 70, 40, 35)
-    draw_pixel_rect(surface, 'dark_gray', 195, 65, 50, 8)  # Cave top
-
-    # Crab (if not moved)
-    if not state.flags['crab_moved']:
-        # Crab body
-        draw_pixel_rect(surface, 'red', 175, 95, 20, 12)
-        draw_pixel_rect(surface, 'light_red', 178, 98, 14, 6)
-        # Claws
-        draw_pixel_rect(surface, 'red', 165, 90, 10, 8)
-        draw_pixel_rect(surface, 'red', 195, 90, 10, 8)
-        # Eyes
-        draw_pixel_rect(surface, 'black', 180, 93, 2, 2)
-        draw_pixel_rect(surface, 'black', 188, 93, 2, 2)
-
-    # Ledge
-    draw_pixel_rect(surface, 'brown', 150, 105, 90, 5)
-
-    # Seagulls
-    for pos in [(50, 30), (100, 20), (280, 35)]:
-        pygame.draw.lines(surface, EGA_COLORS['white'], False,
-                         [(pos[0]-5, pos[1]+3), (pos[0], pos[1]), (pos[0]+5, pos[1]+3)], 1)
-
-def draw_cave(surface, state):
-    """Draw the sea cave"""
-    # Cave walls
-    draw_pixel_rect(surface, 'black', 0, 0, 320, 160)
-
-    # Bioluminescent glow
+    # Pixels outside the surface are dropped, as set_at would do
+    rect = pygame.Rect(x, y, w, h).clip(surface.get_rect())
+    if rect.width and rect.height:
+        tile = get_dither_tile(color1, color2, surface)
+        surface.blit(tile, rect.topleft, rect)
+
+# Ambient animations
+#
+# Effects that would re-roll random pixels on every draw are generated once,
+# from a fixed seed, into a sprite sheet of frames. Rooms blit the frame for
+# the current time, so output is deterministic and an animated room can be
+# cached like any other, one background per frame.
+
+class AmbientAnimation:
+    """A seeded strip of pre-drawn frames cycled at a fixed rate
+
+    A palette_cycled animation is drawn in cycled colors; in indexed mode
+    the palette animates it, so it holds its first frame.
+    """
+    def __init__(self, draw, rect, frames, rate, seed, palette_cycled=False):
+        self.draw = draw
+        self.rect = pygame.Rect(rect)
+        self.frames = frames
+        self.rate = rate
+        self.seed = seed
+        self.palette_cycled = palette_cycled
+        self.sheets = {}
+
+    def build(self, like):
+        """Draw every frame side by side into a sprite sheet in like's format"""
+        w, h = self.rect.size
+        sheet = new_surface((w * self.frames, h), like)
+        sheet.fill(color_value(sheet, 'clear'))
+        sheet.set_colorkey(color_value(sheet, 'clear'))
+        rng = random.Random(self.seed)
+        for frame in range(self.frames):
+            self.draw(sheet.subsurface((frame * w, 0, w, h)), rng, frame)
+        self.sheets[like.get_bitsize()] = sheet
+        return sheet
+
+    def animated(self):
+        return not (self.palette_cycled and indexed_color)
+
+    def frame_at(self, ticks):
+        if not self.animated():
+            return 0
+        return ticks * self.rate // 1000 % self.frames
+
+    def blit(self, surface, frame):
+        sheet = self.sheets.get(surface.get_bitsize()) or self.build(surface)
+        w, h = self.rect.size
+        surface.blit(sheet, self.rect.topleft, (frame * w, 0, w, h))
+
+# room id -> the room's ambient animations
+AMBIENT = {}
+
+# Milliseconds on the animation clock. main() advances it each frame; tools
+# that render headless leave it alone and always see the same frames.
+ambient_ticks = 0
+
+def ambient(room, rect, frames, rate, seed=0, palette_cycled=False):
+    """Register a function(surface, rng, frame) that draws one frame of a room's ambient effect"""
+    def register(draw):
+        AMBIENT.setdefault(room, []).append(AmbientAnimation(draw, rect, frames, rate, seed, palette_cycled))
+        return draw
+    return register
+
+def ambient_frames(room):
+    """Frame index of each of a room's ambient animations right now"""
+    return tuple(anim.frame_at(ambient_ticks) for anim in AMBIENT.get(room, ()))
+
+def ambient_frame_ticks(room):
+    """Animation clock values that show each frame of a room's first ambient animation"""
+    anims = AMBIENT.get(room)
+    if not anims:
+        return [0]
+    # First tick of the clock at which each frame is showing
+    return [-(-frame * 1000 // anims[0].rate) for frame in range(anims[0].frames)]
+
+def draw_ambient(surface, room, index=0):
+    """Blit the current frame of one of a room's ambient animations"""
+    anim = AMBIENT[room][index]
+    anim.blit(surface, anim.frame_at(ambient_ticks))
+
+@ambient('cave', (0, 0, 320, 121), frames=8, rate=8, seed=1, palette_cycled=True)
+def cave_glow(surface, rng, frame):
+    """Twinkling bioluminescence, a fresh scatter each frame"""
     for i in range(50):
-        x = random.randint(0, 319)
-        y = random.randint(0, 120)
-        color = 'cyan' if random.random() > 0.5 else 'light_cyan'
-        surface.set_at((x, y), EGA_COLORS[color])
-
-    # Cave walls detail
-    draw_dithered_rect(surface, 'dark_gray', 'black', 0, 0, 40, 160)
-    draw_dithered_rect(surface, 'dark_gray', 'black', 280, 0, 40, 160)
-
-    # Ancient carvings
-    for y in range(20, 100, 15):
-        draw_pixel_rect(surface, 'cyan', 15, y, 20, 2)
-        draw_pixel_rect(surface, 'cyan', 285, y, 20, 2)
-
-    # Lighthouse symbol carving
-    draw_pixel_rect(surface, 'light_cyan', 20, 40, 8, 20)
-    draw_pixel_rect(surface, 'yellow', 22, 38, 4, 4)
-
-    # Floor
-    draw_dithered_rect(surface, 'dark_gray', 'blue', 0, 130, 320, 30)
-
-    # Water pool
-    draw_pixel_rect(surface, 'blue', 100, 135, 60, 20)
-    draw_dithered_rect(surface, 'light_blue', 'blue', 105, 140, 50, 10)
-
-    # Crystal lens (if not taken)
-    if 'crystal_lens' not in state.inventory:
-        draw_pixel_rect(surface, 'light_cyan', 200, 125, 15, 15)
-        draw_pixel_rect(surface, 'white', 205, 130, 5, 5)
-
-    # Ancient coin (if not taken)
-    if 'ancient_coin' not in state.inventory:
-        draw_pixel_rect(surface, 'yellow', 250, 140, 8, 8)
-        draw_pixel_rect(surface, 'brown', 252, 142, 4, 4)
-
-    # Light rays
-    pygame.draw.line(surface, EGA_COLORS['cyan'], (160, 0), (140, 130), 1)
-    pygame.draw.line(surface, EGA_COLORS['cyan'], (160, 0), (180, 130), 1)
-
-def draw_path(surface, state):
-    """Draw the winding path"""
-    # Sky
-    draw_dithered_rect(surface, 'dark_gray', 'light_gray', 0, 0, 320, 40)
-
-    # Hills
-    draw_pixel_rect(surface, 'green', 0, 40, 320, 120)
-    draw_dithered_rect(surface, 'green', 'light_green', 0, 60, 320, 40)
-
-    # Path
-    pygame.draw.polygon(surface, EGA_COLORS['brown'], [(140, 160), (180, 160), (170, 80), (150, 80)])
-    pygame.draw.polygon(surface, EGA_COLORS['yellow'], [(145, 160), (175, 160), (168, 85), (152, 85)])
-
-    # Well
-    draw_pixel_rect(surface, 'dark_gray', 230, 90, 30, 25)
-    draw_pixel_rect(surface, 'black', 235, 95, 20, 15)
-    draw_pixel_rect(surface, 'brown', 230, 85, 30, 8)  # Well roof
-    draw_pixel_rect(surface, 'brown', 243, 70, 4, 15)  # Post
-
-    # Roses
-    for x in [80, 95, 110, 200, 210]:
-        draw_pixel_rect(surface, 'green', x, 100, 4, 15)
-        draw_pixel_rect(surface, 'light_red', x-2, 95, 8, 8)
-
-    # Ghost
-    ghost_x = 190
-    ghost_y = 70
-    # Ghostly glow
-    draw_dithered_rect(surface, 'light_cyan', 'green', ghost_x-5, ghost_y-5, 30, 50)
-    # Ghost figure
-    draw_pixel_rect(surface, 'light_cyan', ghost_x, ghost_y, 20, 35)
-    draw_pixel_rect(surface, 'white', ghost_x+2, ghost_y+2, 16, 25)
-    # Face
-    draw_pixel_rect(surface, 'light_blue', ghost_x+5, ghost_y+5, 3, 3)
-    draw_pixel_rect(surface, 'light_blue', ghost_x+12, ghost_y+5, 3, 3)
-
-    # Lighthouse in distance
-    draw_pixel_rect(surface, 'light_gray', 150, 10, 20, 35)
-    draw_pixel_rect(surface, 'red', 150, 10, 20, 8)
-
-def draw_garden(surface, state):
-    """Draw the overgrown garden"""
-    # Sky
-    draw_dithered_rect(surface, 'dark_gray', 'light_gray', 0, 0, 320, 30)
-
-    # Background
-    draw_pixel_rect(surface, 'green', 0, 30, 320, 130)
-
-    # Overgrown plants everywhere
-    for i in range(0, 320, 15):
-        h = 20 + random.randint(0, 20)
-        draw_pixel_rect(surface, 'light_green', i, 80, 10, h)
+        x = rng.randint(0, 319)
+        y = rng.randint(0, 120)
+        color = 'glow' if rng.random() > 0.5 else 'glow_alt'
+        draw_pixel(surface, color, x, y)
+
+# Plant heights are rolled once, so the garden sways instead of jittering
+GARDEN_PLANT_HEIGHTS = tuple(20 + h for h in random.Random(2).choices(range(21), k=len(range(0, 320, 15))))
+
+@ambient('garden', (0, 75, 320, 48), frames=8, rate=4)
+def garden_plants(surface, rng, frame):
+    """Plants swaying a little in the wind; surface origin is (0, 75)"""
+    for n, i in enumerate(range(0, 320, 15)):
+        h = GARDEN_PLANT_HEIGHTS[n] + round(2 * math.sin((frame / 8 + n / 5) * 2 * math.pi))
+        draw_pixel_rect(surface, 'light_green', i, 5, 10, h)
         if i % 30 == 0:
-            draw_pixel_rect(surface, 'light_magenta', i+2, 75, 6, 6)  # Flowers
-
-    # Apple tree
-    draw_pixel_rect(surface, 'brown', 200, 60, 15, 50)  # Trunk
-    draw_pixel_rect(surface, 'green', 170, 30, 60, 40)  # Foliage
-    draw_pixel_rect(surface, 'light_green', 180, 40, 40, 25)
-    # Apples
-    if 'apple' not in state.inventory:
-        draw_pixel_rect(surface, 'red', 185, 45, 6, 6)
-    draw_pixel_rect(surface, 'red', 210, 50, 6, 6)
-
-    # Stone bench
-    draw_pixel_rect(surface, 'light_gray', 60, 100, 50, 10)
-    draw_pixel_rect(surface, 'dark_gray', 65, 110, 10, 15)
-    draw_pixel_rect(surface, 'dark_gray', 95, 110, 10, 15)
-
-    # Shed
-    draw_pixel_rect(surface, 'brown', 260, 60, 50, 50)
-    draw_pixel_rect(surface, 'dark_gray', 260, 50, 50, 15)  # Roof
-    draw_pixel_rect(surface, 'black', 275, 80, 15, 30)  # Door
-
-    # Matches on ground
-    if 'matches' not in state.inventory:
-        draw_pixel_rect(surface, 'red', 120, 120, 10, 4)
-        draw_pixel_rect(surface, 'brown', 122, 121, 6, 2)
-
-def draw_shed(surface, state):
-    """Draw inside the shed"""
-    # Walls
-    draw_pixel_rect(surface, 'brown', 0, 0, 320, 160)
-    draw_dithered_rect(surface, 'brown', 'dark_gray', 0, 0, 320, 160)
-
-    # Floor
-    draw_pixel_rect(surface, 'dark_gray', 0, 130, 320, 30)
-
-    # Workbench
-    draw_pixel_rect(surface, 'brown', 80, 90, 160, 10)
-    draw_pixel_rect(surface, 'brown', 90, 100, 10, 40)
-    draw_pixel_rect(surface, 'brown', 220, 100, 10, 40)
-
-    # Tools on wall
-    draw_pixel_rect(surface, 'dark_gray', 50, 40, 5, 40)  # Shovel
-    draw_pixel_rect(surface, 'brown', 48, 35, 9, 8)
-    draw_pixel_rect(surface, 'dark_gray', 70, 50, 3, 30)  # Rake
-    draw_pixel_rect(surface, 'brown', 65, 45, 13, 5)
-
-    # Oil can (if not taken)
-    if 'oil_can' not in state.inventory:
-        draw_pixel_rect(surface, 'dark_gray', 120, 80, 15, 12)
-        draw_pixel_rect(surface, 'yellow', 130, 75, 8, 8)  # Spout
-
-    # Small key (if not taken)
-    if 'small_key' not in state.inventory:
-        draw_pixel_rect(surface, 'yellow', 180, 85, 12, 5)
-        draw_pixel_rect(surface, 'yellow', 175, 83, 8, 8)
-
-    # Cobwebs
-    pygame.draw.lines(surface, EGA_COLORS['light_gray'], False,
-                     [(0, 0), (40, 30), (20, 50), (50, 40)], 1)
-    pygame.draw.lines(surface, EGA_COLORS['light_gray'], False,
-                     [(320, 0), (280, 30), (300, 50), (270, 40)], 1)
-
-    # Door (exit)
-    draw_pixel_rect(surface, 'light_gray', 145, 100, 30, 50)
-    draw_pixel_rect(surface, 'green', 150, 110, 20, 35)  # Light from outside
-
-def draw_lighthouse_exterior(surface, state):
-    """Draw the lighthouse exterior"""
-    # Sky
-    draw_dithered_rect(surface, 'dark_gray', 'blue', 0, 0, 320, 50)
-
-    # Ground
-    draw_pixel_rect(surface, 'green', 0, 120, 320, 40)
-    draw_dithered_rect(surface, 'green', 'brown', 0, 140, 320, 20)
-
-    # Lighthouse
-    draw_pixel_rect(surface, 'light_gray', 120, 20, 80, 100)
-    draw_pixel_rect(surface, 'white', 130, 30, 60, 80)
-    # Red stripes
-    for y in range(30, 110, 20):
-        draw_pixel_rect(surface, 'red', 130, y, 60, 8)
-    # Light chamber
-    draw_pixel_rect(surface, 'dark_gray', 135, 10, 50, 15)
-    draw_pixel_rect(surface, 'black', 140, 12, 40, 10)
-
-    # If lighthouse is lit, show light!
-    if state.flags['lighthouse_lit']:
-        draw_pixel_rect(surface, 'yellow', 145, 13, 30, 8)
-        # Light beams
-        pygame.draw.polygon(surface, EGA_COLORS['yellow'],
-                          [(160, 15), (0, 0), (0, 30)])
-        pygame.draw.polygon(surface, EGA_COLORS['yellow'],
-                          [(160, 15), (320, 0), (320, 30)])
-
-    # Door
-    if state.flags['lighthouse_door_open']:
-        draw_pixel_rect(surface, 'black', 145, 90, 30, 35)
+            draw_pixel_rect(surface, 'light_magenta', i+2, 0, 6, 6)  # Flowers
+
+# Room scenes
+#
+# Every room picture is a display list, drawn in order:
+#
+#   ('rect', color, rect)                      solid fill
+#   ('dither', color1, color2, rect)           checkerboard fill
+#   ('polygon', color, points)
+#   ('line', color, start, end, width)
+#   ('lines', color, points, width)            open polyline
+#   ('arc', color, rect, start, stop, width)
+#   ('ambient', index)                         the room's ambient animation
+#   ('if', condition, nodes[, else_nodes])
+#   ('object', key, nodes)                     nodes showing an examine or item key
+#   ('floor', nodes)                           nodes showing ground Morgan can walk on
+#
+# A condition names a flag (set) or an item (carried), prefixed with ! to
+# negate it. Each room's list is the 'scene' of its room file. Objects and
+# floors draw like any other nodes, and also mark their pixels in the
+# room's hit buffer (see Point and click) or walk mask (see Walking).
+
+# Display lists are compiled, per room and surface format, into a flat list
+# of (condition masks, op, args) with colors resolved and nested conditions
+# folded into bit masks. Compiling drops primitives that a later opaque fill
+# always covers and merges back-to-back fills that form one rectangle.
+
+NO_CONDITION = (0, 0, 0, 0)   # inventory mask, wanted bits, flag mask, wanted bits
+OPAQUE_OPS = ('rect', 'dither')
+
+def condition_masks(condition):
+    """Masks for one condition: (inventory mask, wanted, flag mask, wanted)"""
+    name = condition.lstrip('!')
+    want = not condition.startswith('!')
+    if name in FLAG_BITS:
+        bit = FLAG_BITS[name]
+        return (0, 0, bit, bit if want else 0)
+    bit = ITEM_BITS[name]
+    return (bit, bit if want else 0, 0, 0)
+
+def combine_conditions(a, b):
+    return tuple(x | y for x, y in zip(a, b))
+
+def implies(a, b):
+    """Whether condition a holding guarantees condition b holds"""
+    inv_mask, inv_want, flag_mask, flag_want = b
+    return (not inv_mask & ~a[0] and a[1] & inv_mask == inv_want
+            and not flag_mask & ~a[2] and a[3] & flag_mask == flag_want)
+
+def node_bounds(room, op, args):
+    """Rect enclosing everything a primitive can touch"""
+    if op in OPAQUE_OPS:
+        return pygame.Rect(args[-1])
+    if op == 'ambient':
+        return AMBIENT[room][args[0]].rect
+    if op == 'arc':
+        return pygame.Rect(args[1]).inflate(2 * args[-1], 2 * args[-1])
+    if op == 'line':
+        points, width = args[1:3], args[3]
+    elif op == 'lines':
+        points, width = args[1], args[2]
     else:
-        draw_pixel_rect(surface, 'dark_gray', 145, 90, 30, 35)
-        draw_pixel_rect(surface, 'brown', 148, 93, 24, 29)
-        draw_pixel_rect(surface, 'yellow', 165, 108, 4, 4)  # Keyhole
-
-    # Bell tower
-    draw_pixel_rect(surface, 'brown', 50, 80, 30, 40)
-    draw_pixel_rect(surface, 'brown', 45, 75, 40, 8)  # Roof
-    draw_pixel_rect(surface, 'yellow', 58, 90, 14, 16)  # Bell
-    draw_pixel_rect(surface, 'brown', 64, 106, 2, 15)  # Rope
-
-    # Path
-    draw_pixel_rect(surface, 'brown', 140, 120, 40, 40)
-
-def draw_lighthouse_interior(surface, state):
-    """Draw inside the lighthouse ground floor"""
-    # Walls
-    draw_pixel_rect(surface, 'light_gray', 0, 0, 320, 160)
-    draw_dithered_rect(surface, 'light_gray', 'white', 20, 10, 280, 140)
-
-    # Floor
-    draw_pixel_rect(surface, 'brown', 0, 140, 320, 20)
-
-    # Spiral staircase
-    draw_pixel_rect(surface, 'dark_gray', 200, 40, 60, 100)
-    for y in range(50, 130, 15):
-        draw_pixel_rect(surface, 'brown', 205, y, 50, 8)
-    draw_pixel_rect(surface, 'black', 200, 30, 60, 15)  # Opening above
-
-    # Desk
-    draw_pixel_rect(surface, 'brown', 40, 100, 80, 10)
-    draw_pixel_rect(surface, 'brown', 50, 110, 10, 30)
-    draw_pixel_rect(surface, 'brown', 100, 110, 10, 30)
-
-    # Journal on desk
-    if 'journal' not in state.inventory:
-        draw_pixel_rect(surface, 'light_gray', 60, 92, 20, 12)
-        draw_pixel_rect(surface, 'brown', 62, 94, 16, 8)
-
-    # Lantern hook
-    draw_pixel_rect(surface, 'dark_gray', 180, 60, 3, 20)
-    if 'lantern' not in state.inventory:
-        draw_pixel_rect(surface, 'yellow', 175, 75, 12, 15)
-        draw_pixel_rect(surface, 'dark_gray', 178, 72, 6, 5)
-
-    # Photos on wall
-    draw_pixel_rect(surface, 'brown', 50, 50, 25, 20)
-    draw_pixel_rect(surface, 'light_gray', 52, 52, 21, 16)
-    draw_pixel_rect(surface, 'brown', 90, 50, 25, 20)
-    draw_pixel_rect(surface, 'light_gray', 92, 52, 21, 16)
-
-    # Door to outside
-    draw_pixel_rect(surface, 'brown', 145, 100, 30, 50)
-    draw_pixel_rect(surface, 'light_gray', 150, 110, 20, 35)
-
-def draw_lighthouse_stairs(surface, state):
-    """Draw the spiral staircase"""
-    # Dark interior
-    draw_pixel_rect(surface, 'dark_gray', 0, 0, 320, 160)
-
-    # Curved wall effect
-    draw_dithered_rect(surface, 'dark_gray', 'light_gray', 0, 0, 60, 160)
-    draw_dithered_rect(surface, 'dark_gray', 'light_gray', 260, 0, 60, 160)
-
-    # Stairs
-    for i, y in enumerate(range(130, 30, -20)):
-        x_offset = 30 * math.sin(i * 0.8)
-        draw_pixel_rect(surface, 'brown', int(100 + x_offset), y, 80, 12)
-        draw_pixel_rect(surface, 'dark_gray', int(100 + x_offset), y-3, 80, 4)
-
-    # Railing
-    draw_pixel_rect(surface, 'dark_gray', 90, 30, 5, 120)
-
-    # Window
-    draw_pixel_rect(surface, 'light_gray', 270, 60, 30, 40)
-    draw_pixel_rect(surface, 'light_blue', 275, 65, 20, 30)
-    draw_pixel_rect(surface, 'dark_gray', 284, 65, 2, 30)
-
-    # Light from above
-    pygame.draw.polygon(surface, EGA_COLORS['light_gray'],
-                       [(160, 0), (120, 30), (200, 30)])
-
-def draw_light_chamber(surface, state):
-    """Draw the light chamber at top of lighthouse"""
-    # Glass walls (view outside)
-    draw_dithered_rect(surface, 'light_blue', 'blue', 0, 0, 320, 100)
-
-    # Distant sea and ghost ships
-    draw_pixel_rect(surface, 'blue', 0, 70, 320, 30)
-    # Ghost ships on horizon
-    for x in [30, 100, 200, 280]:
-        draw_dithered_rect(surface, 'light_gray', 'light_blue', x, 60, 20, 15)
-
-    # Floor
-    draw_pixel_rect(surface, 'dark_gray', 0, 100, 320, 60)
-    draw_dithered_rect(surface, 'dark_gray', 'brown', 0, 120, 320, 40)
-
-    # Lens housing (center)
-    draw_pixel_rect(surface, 'dark_gray', 130, 80, 60, 50)
-    draw_pixel_rect(surface, 'brown', 135, 85, 50, 40)
-
-    # Lens spot
-    if state.flags['lens_installed']:
-        draw_pixel_rect(surface, 'light_cyan', 150, 95, 20, 20)
-        draw_pixel_rect(surface, 'white', 155, 100, 10, 10)
-        if state.flags['lighthouse_lit']:
-            # Glowing!
-            draw_pixel_rect(surface, 'yellow', 145, 90, 30, 30)
-            draw_pixel_rect(surface, 'white', 155, 100, 10, 10)
-    else:
-        draw_pixel_rect(surface, 'black', 150, 95, 20, 20)
-
-    # Mirror brackets
-    draw_pixel_rect(surface, 'dark_gray', 60, 90, 20, 25)
-    draw_pixel_rect(surface, 'dark_gray', 240, 90, 20, 25)
-
-    # Left mirror (always there)
-    draw_pixel_rect(surface, 'light_cyan', 63, 93, 14, 19)
-
-    # Right mirror (player must place)
-    if state.flags['mirror_placed']:
-        draw_pixel_rect(surface, 'light_cyan', 243, 93, 14, 19)
-    else:
-        draw_pixel_rect(surface, 'black', 243, 93, 14, 19)
-
-    # Frame/ceiling
-    draw_pixel_rect(surface, 'brown', 0, 0, 320, 10)
-    draw_pixel_rect(surface, 'dark_gray', 0, 0, 10, 100)
-    draw_pixel_rect(surface, 'dark_gray', 310, 0, 10, 100)
+        points, width = args[1], 1
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    return pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1).inflate(2 * width, 2 * width)
+
+def flatten_scene(nodes, condition=NO_CONDITION, hits=None, object_id=0, layer='object'):
+    """Yield (condition, op, args) for every primitive, outermost conditions folded in
+
+    With hits, a dict of keys to ids, primitives are redrawn for a layer's
+    mask instead: filled with the id of the layer's group ('object' or
+    'floor') they belong to, or 0 for anything else, which hides whatever
+    lies behind it.
+    """
+    for node in nodes:
+        op, args = node[0], node[1:]
+        if op in ('object', 'floor'):
+            key, children = (args[0], args[1]) if op == 'object' else (op, args[0])
+            inner_id = object_id
+            if hits is not None and op == layer:
+                inner_id = hits.setdefault(key, len(hits) + 1)
+            yield from flatten_scene(children, condition, hits, inner_id, layer)
+            continue
+        if op != 'if':
+            if hits is None:
+                yield condition, op, args
+            elif op == 'dither':
+                yield condition, 'rect', (object_id, args[-1])
+            elif op != 'ambient':
+                yield condition, op, (object_id,) + args[1:]
+            elif object_id:
+                # Animations are see-through unless they are the object; the
+                # room's animation rect is filled once the room is known
+                yield condition, op, args + (object_id,)
+            continue
+        test, branches = args[0], args[1:]
+        yield from flatten_scene(branches[0], combine_conditions(condition, condition_masks(test)),
+                                 hits, object_id, layer)
+        if len(branches) > 1:
+            negated = test[1:] if test.startswith('!') else '!' + test
+            yield from flatten_scene(branches[1], combine_conditions(condition, condition_masks(negated)),
+                                     hits, object_id, layer)
+
+def merged_fill(a, b):
+    """One fill equal to fills a then b, or None if they don't form a rectangle"""
+    (cond_a, op_a, args_a), (cond_b, op_b, args_b) = a, b
+    if op_a not in OPAQUE_OPS or (cond_a, op_a, args_a[:-1]) != (cond_b, op_b, args_b[:-1]):
+        return None
+    ra, rb = pygame.Rect(args_a[-1]), pygame.Rect(args_b[-1])
+    side_by_side = ra.y == rb.y and ra.h == rb.h and ra.x <= rb.right and rb.x <= ra.right
+    stacked = ra.x == rb.x and ra.w == rb.w and ra.y <= rb.bottom and rb.y <= ra.bottom
+    if not (side_by_side or stacked):
+        return None
+    return cond_a, op_a, args_a[:-1] + (tuple(ra.union(rb)),)
+
+def compile_scene(room, like, hits=None, layer='object'):
+    """Compile a room's display list for surfaces in like's format
+
+    With hits, a dict that collects keys and their ids, compile the display
+    list of the room's hit buffer, or with layer='floor' its walk mask,
+    instead (like is then unused).
+    """
+    commands = list(flatten_scene(ROOMS[room].get('scene', ()), hits=hits, layer=layer))
+
+    # Walking back to front, drop what a later opaque fill always covers
+    covers = []
+    visible = []
+    for condition, op, args in reversed(commands):
+        bounds = node_bounds(room, op, args)
+        if any(cover.contains(bounds) and implies(condition, when) for when, cover in covers):
+            continue
+        if op in OPAQUE_OPS:
+            covers.append((condition, bounds))
+        visible.append((condition, op, args))
+    visible.reverse()
+
+    compiled = []
+    for command in visible:
+        merged = merged_fill(compiled[-1], command) if compiled else None
+        if merged:
+            compiled[-1] = merged
+        else:
+            compiled.append(command)
+
+    # Resolve colors for the target format; dithers stay named for their tile cache
+    resolved = []
+    for condition, op, args in compiled:
+        if hits is not None:
+            # Already in object ids
+            if op == 'lines':
+                args = (args[0], False) + args[1:]
+            elif op == 'ambient':
+                op, args = 'rect', (args[1], AMBIENT[room][args[0]].rect)
+        elif op == 'lines':
+            args = (color_value(like, args[0]), False) + args[1:]
+        elif op not in ('dither', 'ambient'):
+            args = (color_value(like, args[0]),) + args[1:]
+        elif op == 'dither':
+            args = args[:2] + tuple(args[2])
+        else:
+            args = (room,) + args
+        resolved.append((condition, op, args))
+    return resolved
+
+# (room, bit size) -> compiled display list
+compiled_scenes = {}
+
+def run_display_list(surface, commands, state):
+    """Execute a compiled display list for a state"""
+    inventory, flags = state.inventory_bits, state.flag_bits
+    for (inv_mask, inv_want, flag_mask, flag_want), op, args in commands:
+        if inventory & inv_mask != inv_want or flags & flag_mask != flag_want:
+            continue
+        if op == 'dither':
+            draw_dithered_rect(surface, *args)
+        elif op == 'ambient':
+            draw_ambient(surface, *args)
+        else:
+            # Looked up per call so the frame profiler's counters see it
+            getattr(pygame.draw, op)(surface, *args)
 
 def draw_scene(surface, state):
     """Draw the current room"""
     room = state.current_room
+    key = (room, surface.get_bitsize())
+    commands = compiled_scenes.get(key)
+    if commands is None:
+        commands = compiled_scenes[key] = compile_scene(room, surface)
+    run_display_list(surface, commands, state)
+
+def condition_names(nodes):
+    """Yield the flag and item names a display list's conditions test"""
+    for node in nodes:
+        if node[0] == 'if':
+            yield node[1].lstrip('!')
+            for branch in node[2:]:
+                yield from condition_names(branch)
+        elif node[0] in ('object', 'floor'):
+            yield from condition_names(node[-1])
+
+def scene_objects(nodes):
+    """Yield the key of every object in a display list"""
+    for node in nodes:
+        if node[0] == 'object':
+            yield node[1]
+            yield from scene_objects(node[2])
+        elif node[0] == 'floor':
+            yield from scene_objects(node[1])
+        elif node[0] == 'if':
+            for branch in node[2:]:
+                yield from scene_objects(branch)
+
+def scene_deps(nodes):
+    """The items and flags a display list reads, in order of first appearance"""
+    names = list(dict.fromkeys(condition_names(nodes)))
+    return {'items': tuple(name for name in names if name in ITEM_BITS),
+            'flags': tuple(name for name in names if name in FLAG_BITS)}
+
+def room_render_deps(room):
+    """Inventory items and flags a room's scene reads
+
+    A room's picture is fully determined by these bits, so they make up its
+    render cache key.
+    """
+    return scene_deps(ROOMS[room].get('scene', ()))
+
+def render_masks(deps):
+    """Fold a room's render deps into (inventory mask, flag mask)"""
+    items = sum(ITEM_BITS[item] for item in deps.get('items', ()))
+    flags = sum(FLAG_BITS[flag] for flag in deps.get('flags', ()))
+    return items, flags
+
+# room id -> (inventory mask, flag mask), filled in as rooms are drawn
+ROOM_RENDER_MASKS = {}
+
+def room_render_masks(room):
+    masks = ROOM_RENDER_MASKS.get(room)
+    if masks is None:
+        masks = ROOM_RENDER_MASKS[room] = render_masks(room_render_deps(room))
+    return masks
+
+def render_state(room, settings):
+    """A state showing room with the given (item or flag, value) settings"""
+    state = GameState()
+    state.current_room = room
+    for name, value in settings:
+        if name in FLAG_BITS:
+            state.flags[name] = value
+        elif value:
+            state.add_to_inventory(name)
+    return state
+
+def render_states():
+    """Yield (room, settings) for every combination of a room's render deps"""
+    for room in ROOMS:
+        deps = room_render_deps(room)
+        names = list(deps.get('items', ())) + list(deps.get('flags', ()))
+        for values in itertools.product((False, True), repeat=len(names)):
+            yield room, list(zip(names, values))
+
+# The title screen's stars scroll one pixel per step
+TITLE_RATE = 30
+
+def scene_key(state, room=None):
+    """Build the render cache key for a room under the given state"""
+    room = room or state.current_room
+    items, flags = room_render_masks(room)
+    return (room, state.inventory_bits & items, state.flag_bits & flags, ambient_frames(room))
+
+class SurfaceCache:
+    """Bounded LRU cache of rendered surfaces"""
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        self.entries[key] = surface
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+# Room backgrounds, including one per frame of each animated room
+scene_cache = SurfaceCache(max_entries=32)
+
+def invalidate_scene_cache(state):
+    """Drop cached backgrounds, masks and paths that no longer match the world state"""
+    for cache in (scene_cache, hit_cache, nav_cache, path_cache):
+        for key in list(cache.entries):
+            # Other animation frames of a room stay valid
+            if key[:3] != scene_key(state, key[0])[:3]:
+                cache.discard(key)
+
+def draw_cached_scene(surface, state):
+    """Draw the current room from the render cache, composing it on a miss"""
+    key = scene_key(state)
+    background = scene_cache.get(key)
+    if background is None:
+        background = baked(scene_asset_name(key), key[0])
+        if background is None:
+            background = new_surface(surface.get_size(), surface)
+            draw_scene(background, state)
+        scene_cache.put(key, background)
+    surface.blit(background, (0, 0))
+
+# Point and click
+#
+# Every room background has a hit buffer to go with it: one byte per
+# game_surface pixel holding the id of the scene object drawn there, 0 for
+# none. It is drawn from the room's display list, compiled once more with
+# object ids in place of colors, the first time the player clicks on that
+# background, and is then cached beside it, so resolving a click is a
+# single index into it.
+
+# scene_key()[:3] -> (object keys by id, None first; pixel ids, row by row)
+hit_cache = SurfaceCache(max_entries=32)
+
+def draw_mask(state, layer='object'):
+    """Draw one layer of the current room as (keys by id, None first; pixel ids)"""
+    room = state.current_room
+    compiled = compiled_scenes.get((room, layer))
+    if compiled is None:
+        ids = {}
+        commands = compile_scene(room, None, ids, layer)
+        compiled = compiled_scenes[(room, layer)] = ((None,) + tuple(ids), commands)
+    keys, commands = compiled
+    surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), 0, 8)
+    run_display_list(surface, commands, state)
+    return keys, pygame.image.tobytes(surface, 'P')
+
+def hit_buffer(state):
+    """The hit buffer for the current room under a state"""
+    key = scene_key(state)[:3]
+    hits = hit_cache.get(key)
+    if hits is None:
+        hits = draw_mask(state)
+        hit_cache.put(key, hits)
+    return hits
+
+def object_at(state, x, y):
+    """The examine or item key drawn at a game_surface pixel, or None"""
+    if not SCENE_RECT.collidepoint(x, y) or INVENTORY_RECT.collidepoint(x, y):
+        return None
+    keys, ids = hit_buffer(state)
+    return keys[ids[y * GAME_WIDTH + x]]
+
+def click_command(state, x, y):
+    """The command a click on a game_surface pixel stands for, or None
+
+    Clicking an object looks at it; an item with nothing to say about it is
+    picked up instead.
+    """
+    key = object_at(state, x, y)
+    if key is None:
+        return None
+    verb = 'look' if key in ROOMS[state.current_room].get('examine', {}) else 'get'
+    return f"{verb} {key.replace('_', ' ')}"
+
+# Walking
+#
+# Morgan walks about on screen. Where he can stand comes from the room's
+# walk mask, drawn like the hit buffer from its 'floor' nodes, so anything
+# drawn over the floor is in his way. The mask is sampled into a grid of
+# NAV_CELL pixel cells, and the open cells with the steps between them make
+# up the room's navigation graph, built once per background. Paths are
+# found with A* over the graph and memoized. A room file's 'doors' give
+# the spot to walk to for each exit, which is also where Morgan stands
+# when he comes in through it.
+
+NAV_CELL = 8
+NAV_COLUMNS = GAME_WIDTH // NAV_CELL
+NAV_ROWS = 160 // NAV_CELL            # the scene, above the text panel
+NAV_STEPS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+WALK_SPEED = 50                       # pixels per second
+WALK_RATE = 20                        # redraws per second while walking
+STRIDE = 5                            # pixels per step of the walk cycle
+DOOR_RADIUS = 12                      # clicks this close to a door go through it
+ENTRY_SPOT = (160, 150)               # where Morgan starts in a room without a door back
+
+# scene_key()[:3] -> {cell: ((neighbour, cost), ...)}
+nav_cache = SurfaceCache(max_entries=32)
+# scene_key()[:3] + (start cell, goal cell) -> waypoints, or False if unreachable
+path_cache = SurfaceCache(max_entries=256)
+
+def nav_graph(state):
+    """The navigation graph for the current room under a state"""
+    key = scene_key(state)[:3]
+    graph = nav_cache.get(key)
+    if graph is None:
+        _, mask = draw_mask(state, 'floor')
+        # One sample from the middle of each cell, into a grid with a closed
+        # border so no step needs a bounds check
+        half = NAV_CELL // 2
+        width = NAV_COLUMNS + 2
+        grid = bytearray(width * (NAV_ROWS + 2))
+        for cy in range(NAV_ROWS):
+            start = (cy + 1) * width + 1
+            grid[start:start + NAV_COLUMNS] = mask[(cy * NAV_CELL + half) * GAME_WIDTH + half::NAV_CELL][:NAV_COLUMNS]
+        # Diagonal steps may not cut the corner of a blocked cell
+        steps = [(dy * width + dx, dx, dy * width, (dx, dy), math.hypot(dx, dy)) for dx, dy in NAV_STEPS]
+        graph = {}
+        for i, sample in enumerate(grid):
+            if sample:
+                cx, cy = i % width - 1, i // width - 1
+                graph[(cx, cy)] = tuple(((cx + dx, cy + dy), cost) for offset, across, down, (dx, dy), cost in steps
+                                        if grid[i + offset] and grid[i + across] and grid[i + down])
+        nav_cache.put(key, graph)
+    return graph
+
+def cell_center(cell):
+    return (cell[0] * NAV_CELL + NAV_CELL // 2, cell[1] * NAV_CELL + NAV_CELL // 2)
+
+def nearest_cell(graph, x, y):
+    """The open cell nearest a pixel, or None if the room has no floor"""
+    if not graph:
+        return None
+    target = (int(x) // NAV_CELL, int(y) // NAV_CELL)
+    if target in graph:
+        return target
+    return min(graph, key=lambda cell: (cell[0] - target[0]) ** 2 + (cell[1] - target[1]) ** 2)
+
+def find_path(graph, start, goal):
+    """A* over a navigation graph, returning the cells from start to goal, or None"""
+    def estimate(cell):
+        # Octile distance: exact on an open 8-way grid
+        dx, dy = abs(cell[0] - goal[0]), abs(cell[1] - goal[1])
+        return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+    frontier = [(estimate(start), start)]
+    came_from = {start: None}
+    cost = {start: 0}
+    while frontier:
+        _, cell = heapq.heappop(frontier)
+        if cell == goal:
+            break
+        for neighbour, step in graph[cell]:
+            new_cost = cost[cell] + step
+            if new_cost < cost.get(neighbour, math.inf):
+                cost[neighbour] = new_cost
+                came_from[neighbour] = cell
+                heapq.heappush(frontier, (new_cost + estimate(neighbour), neighbour))
+    else:
+        return None
+    cells = []
+    while cell is not None:
+        cells.append(cell)
+        cell = came_from[cell]
+    return cells[::-1]
+
+def waypoints(cells):
+    """Pixel points where a path of cells turns, ending at its last cell"""
+    points = []
+    for i in range(1, len(cells)):
+        if i + 1 < len(cells):
+            (x0, y0), (x1, y1), (x2, y2) = cells[i - 1:i + 2]
+            if (x1 - x0, y1 - y0) == (x2 - x1, y2 - y1):
+                continue
+        points.append(cell_center(cells[i]))
+    return tuple(points)
+
+def walk_path(state, start, goal):
+    """Memoized waypoints between two cells of the current room, or None"""
+    key = scene_key(state)[:3] + (start, goal)
+    points = path_cache.get(key)
+    if points is None:
+        cells = find_path(nav_graph(state), start, goal)
+        points = waypoints(cells) if cells else False
+        path_cache.put(key, points)
+    return points if points is not False else None
+
+class Walker:
+    """Morgan's spot in the current room and the path he is walking"""
+    def __init__(self):
+        self.room = None
+        self.x = self.y = 0
+        self.path = []
+        self.then = None        # command to run on arriving
+        self.facing = 1
+        self.walked = 0.0
+        self.moved_at = None
+
+    def enter(self, state, previous=None):
+        """Stand Morgan in the room just entered, at the door he came in by"""
+        room = ROOMS[state.current_room]
+        doors = room.get('doors', {})
+        back = [doors[way] for way, target in room['exits'].items() if target == previous and way in doors]
+        x, y = back[0] if back else ENTRY_SPOT
+        cell = nearest_cell(nav_graph(state), x, y)
+        self.x, self.y = cell_center(cell) if cell else (x, y)
+        self.room = state.current_room
+        self.path = []
+        self.then = None
+
+    def walk_to(self, state, x, y, then=None):
+        """Start walking to a pixel, running then on arrival; False if it can't be reached"""
+        graph = nav_graph(state)
+        start, goal = nearest_cell(graph, self.x, self.y), nearest_cell(graph, x, y)
+        points = walk_path(state, start, goal) if start and goal else None
+        if points is None:
+            return False
+        self.path = list(points)
+        self.then = then
+        self.moved_at = None
+        return True
+
+    def click(self, state, x, y):
+        """Walk to a door or a spot on the floor clicked on; False if the click was elsewhere
+
+        Leaving by a door Morgan can't walk to happens at once, and the
+        parser allows or refuses it as usual.
+        """
+        if not SCENE_RECT.collidepoint(x, y) or INVENTORY_RECT.collidepoint(x, y):
+            return False
+        for way, (door_x, door_y) in ROOMS[state.current_room].get('doors', {}).items():
+            if math.hypot(x - door_x, y - door_y) <= DOOR_RADIUS:
+                if not self.walk_to(state, door_x, door_y, f"go {way}"):
+                    self.path, self.then = [], f"go {way}"
+                return True
+        if (x // NAV_CELL, y // NAV_CELL) not in nav_graph(state):
+            return False
+        self.walk_to(state, x, y)
+        return True
+
+    def update(self, now):
+        """Move along the path to the clock in ms, returning the arrival command if any"""
+        # A stalled frame doesn't make Morgan jump
+        budget = 0 if self.moved_at is None else WALK_SPEED * min(now - self.moved_at, 100) / 1000
+        self.moved_at = now
+        while self.path and budget > 0:
+            target_x, target_y = self.path[0]
+            dx, dy = target_x - self.x, target_y - self.y
+            distance = math.hypot(dx, dy)
+            if dx:
+                self.facing = 1 if dx > 0 else -1
+            step = min(distance, budget)
+            if step == distance:
+                self.x, self.y = target_x, target_y
+                self.path.pop(0)
+            else:
+                self.x += dx * step / distance
+                self.y += dy * step / distance
+            self.walked += step
+            budget -= step
+        if self.path:
+            return None
+        then, self.then = self.then, None
+        return then
+
+    def signature(self):
+        """What drawing Morgan depends on: (x, y, walk frame, facing)"""
+        frame = int(self.walked // STRIDE) % 2 if self.path else 0
+        return (round(self.x), round(self.y), frame, self.facing)
+
+# Dirty rects for Morgan are snapped to tiles, so the presenter only ever
+# sees a small set of distinct rects
+SPRITE_TILE = 16
+
+def sprite_rect(signature):
+    """Tile-aligned game_surface rect covering Morgan drawn at a signature"""
+    x, y = signature[:2]
+    left, top = (x - 4) // SPRITE_TILE * SPRITE_TILE, (y - 20) // SPRITE_TILE * SPRITE_TILE
+    right, bottom = -(-(x + 5) // SPRITE_TILE) * SPRITE_TILE, -(-(y + 1) // SPRITE_TILE) * SPRITE_TILE
+    return pygame.Rect(left, top, right - left, bottom - top).clip(SCENE_RECT)
+
+def draw_morgan(surface, signature):
+    """Draw Morgan standing with his feet at (x, y)"""
+    x, y, frame, facing = signature
+    draw_pixel_rect(surface, 'brown', x - 2, y - 20, 5, 2)            # Hair
+    draw_pixel_rect(surface, 'light_red', x - 2, y - 18, 5, 4)        # Face
+    draw_pixel(surface, 'black', x + facing, y - 17)                 # Eye
+    draw_pixel_rect(surface, 'white', x - 3, y - 14, 7, 7)            # Shirt
+    draw_pixel_rect(surface, 'blue', x - 3, y - 12, 7, 1)
+    draw_pixel_rect(surface, 'blue', x - 3, y - 7, 7, 3)              # Trousers
+    if frame:
+        # Mid-stride
+        draw_pixel_rect(surface, 'blue', x - 4, y - 4, 2, 4)
+        draw_pixel_rect(surface, 'blue', x + 2, y - 4, 2, 4)
+    else:
+        draw_pixel_rect(surface, 'blue', x - 3, y - 4, 2, 4)
+        draw_pixel_rect(surface, 'blue', x + 1, y - 4, 2, 4)
 
-    if room == 'beach':
-        draw_beach(surface, state)
-    elif room == 'cliffs':
-        draw_cliffs(surface, state)
-    elif room == 'cave':
-        draw_cave(surface, state)
-    elif room == 'path':
-        draw_path(surface, state)
-    elif room == 'garden':
-        draw_garden(surface, state)
-    elif room == 'shed':
-        draw_shed(surface, state)
-    elif room == 'lighthouse_exterior':
-        draw_lighthouse_exterior(surface, state)
-    elif room == 'lighthouse_interior':
-        draw_lighthouse_interior(surface, state)
-    elif room == 'lighthouse_stairs':
-        draw_lighthouse_stairs(surface, state)
-    elif room == 'light_chamber':
-        draw_light_chamber(surface, state)
+def draw_sprite_step(surface, state, walker, rect):
+    """Redraw Morgan within rect over the cached background; False on a cache miss"""
+    background = scene_cache.get(scene_key(state))
+    if background is None:
+        return False
+    surface.blit(background, rect, rect)
+    surface.set_clip(rect)
+    draw_morgan(surface, walker.signature())
+    surface.set_clip(None)
+    return True
+
+def forget_room(room):
+    """Drop everything rendered from a room evicted from ROOMS"""
+    ROOM_RENDER_MASKS.pop(room, None)
+    for key in [key for key in compiled_scenes if key[0] == room]:
+        del compiled_scenes[key]
+    for cache in (scene_cache, hit_cache, nav_cache, path_cache):
+        for key in [key for key in cache.entries if key[0] == room]:
+            cache.discard(key)
+    for anim in AMBIENT.get(room, ()):
+        anim.sheets.clear()
+    if asset_pack:
+        asset_pack.forget(room + '.')
+
+# Asset pack
+#
+# lighthouse_assets.py bakes every room background, the win screen and the
+# title art into one file: a header, a JSON index, then raw pixel rows. The
+# game maps it copy-on-write and wraps each picture as a surface in place,
+# so the first frames of a cold start need no drawing and pictures that are
+# never shown are never read from disk. A missing or stale pack just means
+# everything is drawn as before. Room pictures are checked against their
+# room file when the room is first drawn, not all at startup.
+
+ASSET_PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lighthouse_assets.pack')
+ASSET_PACK_MAGIC = b'LHPACK01'
+ASSET_PACK_HEADER = struct.Struct('<8sI')   # magic, index length
+
+def asset_source_hash():
+    """Digest of what baked pictures depend on: this file and the pygame build"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        source = f.read()
+    versions = f"{pygame.version.ver} {pygame.version.SDL}".encode()
+    return hashlib.blake2b(source + versions, digest_size=16).hexdigest()
+
+def room_source_hash(room):
+    with open(os.path.join(ROOMS_DIR, room + '.py'), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def asset_size(width, height, fmt):
+    return width * height * (3 if fmt == 'RGB' else 1)
+
+def scene_asset_name(key):
+    """Pack entry name of a scene_key()"""
+    room, items, flags, frames = key
+    return '.'.join(map(str, (room, items, flags) + frames))
+
+def title_asset_name(beams):
+    # Title text is antialiased in RGB mode only, so each mode has its own art
+    return f"title.{'indexed' if indexed_color else 'rgb'}.beams={int(beams)}"
+
+class AssetPack:
+    """Pictures from a mapped asset pack, wrapped as surfaces on first use"""
+    def __init__(self, mapping, base, entries, room_hashes):
+        self.mapping = mapping
+        self.base = base
+        self.entries = entries
+        self.room_hashes = room_hashes
+        self.current_rooms = {}
+        self.surfaces = {}
+
+    def room_current(self, room):
+        """Whether a room's pictures were baked from its present room file"""
+        current = self.current_rooms.get(room)
+        if current is None:
+            current = self.current_rooms[room] = self.room_hashes.get(room) == room_source_hash(room)
+        return current
+
+    def surface(self, name, room=None):
+        """The named picture, or None if the pack doesn't have it
+
+        Pictures of a room are only used while its room file is unchanged.
+        """
+        surface = self.surfaces.get(name)
+        if surface is None and name in self.entries and (room is None or self.room_current(room)):
+            offset, width, height, fmt = self.entries[name]
+            start = self.base + offset
+            pixels = memoryview(self.mapping)[start:start + asset_size(width, height, fmt)]
+            surface = pygame.image.frombuffer(pixels, (width, height), fmt)
+            if fmt == 'P':
+                # In indexed mode the palettes must match entry for entry, or
+                # blits remap cycled slots to the plain color they start as
+                surface.set_palette(game_surface.get_palette() if indexed_color else palette_at(0))
+            self.surfaces[name] = surface
+        return surface
+
+    def forget(self, prefix):
+        """Drop the surfaces wrapped for pictures whose names start with prefix"""
+        for name in [name for name in self.surfaces if name.startswith(prefix)]:
+            del self.surfaces[name]
+        self.current_rooms.pop(prefix.rstrip('.'), None)
+
+asset_pack = None
+
+def load_asset_pack(path=ASSET_PACK_PATH):
+    """Map an asset pack, or return None if it is missing, damaged or stale"""
+    try:
+        with open(path, 'rb') as f:
+            # Copy-on-write: surfaces need writable pixels, but nothing
+            # draws on them, so every page stays shared with the file
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, index_size = ASSET_PACK_HEADER.unpack_from(mapping)
+        index = json.loads(mapping[ASSET_PACK_HEADER.size:ASSET_PACK_HEADER.size + index_size])
+    except (struct.error, ValueError):
+        return None
+    base = ASSET_PACK_HEADER.size + index_size
+    end = max((offset + asset_size(w, h, fmt) for offset, w, h, fmt in index['entries'].values()), default=0)
+    if magic != ASSET_PACK_MAGIC or base + end > len(mapping):
+        return None
+    if index['source'] != asset_source_hash():
+        print(f"{path} was baked from other source; drawing instead (rebuild it with lighthouse_assets.py)",
+              file=sys.stderr)
+        return None
+    return AssetPack(mapping, base, index['entries'], index.get('rooms', {}))
+
+def baked(name, room=None):
+    """A picture from the loaded asset pack, or None"""
+    return asset_pack.surface(name, room) if asset_pack else None
+
+def blit_baked(surface, name):
+    """Blit a baked picture over the whole surface, returning whether there was one"""
+    picture = baked(name)
+    if picture is None:
+        return False
+    surface.blit(picture, (0, 0))
+    return True
+
+# Rendered text keyed by (font, text, color). The UI redraws the same few
+# strings over and over, so only new text ever reaches font.render.
+text_cache = SurfaceCache(max_entries=128)
+
+def render_text(font, text, color):
+    """Render a string in an EGA color through the text cache"""
+    # Indexed mode has no in-between colors to antialias with
+    antialias = not indexed_color
+    key = (font, text, color, antialias)
+    text_surface = text_cache.get(key)
+    if text_surface is None:
+        text_surface = font.render(text, antialias, EGA_COLORS[color])
+        text_cache.put(key, text_surface)
+    return text_surface
+
+@functools.lru_cache(maxsize=64)
+def wrap_message(message, width=60):
+    """Wrap a message into display lines, memoized per message"""
+    return tuple(textwrap.wrap(message, width=width))
 
 def draw_ui(surface, state, input_text):
     """Draw the UI elements"""
@@ -673,24 +1315,24 @@ def draw_ui(surface, state, input_text):
 
     # Room name
     room_data = ROOMS[state.current_room]
-    name_surface = font_small.render(room_data['name'], True, EGA_COLORS['yellow'])
+    name_surface = render_text(font_small, room_data['name'], 'yellow')
     surface.blit(name_surface, (5, 163))
 
     # Message text (wrapped)
     if state.message:
-        wrapped = textwrap.wrap(state.message, width=60)
+        wrapped = wrap_message(state.message)
         for i, line in enumerate(wrapped[:2]):
-            text_surface = font_small.render(line, True, EGA_COLORS['light_cyan'])
+            text_surface = render_text(font_small, line, 'light_cyan')
             surface.blit(text_surface, (5, 175 + i * 10))
 
     # Input line
-    input_surface = font_small.render("> " + input_text + "_", True, EGA_COLORS['white'])
+    input_surface = render_text(font_small, "> " + input_text + "_", 'white')
     surface.blit(input_surface, (5, 195))
 
     # Inventory display (right side)
     inv_x = 240
     draw_pixel_rect(surface, 'dark_gray', inv_x, 0, 80, 12)
-    inv_label = font_small.render("INVENTORY", True, EGA_COLORS['yellow'])
+    inv_label = render_text(font_small, "INVENTORY", 'yellow')
     surface.blit(inv_label, (inv_x + 10, 1))
 
     # Show inventory items as icons
@@ -721,6 +1363,107 @@ def draw_ui(surface, state, input_text):
         elif item == 'mirror_shard':
             draw_pixel_rect(surface, 'light_cyan', ix, iy, 8, 12)
 
+# Command dispatch
+#
+# Verbs map straight to handler functions. Rules that only apply in some
+# rooms are registered against those rooms and compiled, once, into a
+# per-room rule list that keeps the original evaluation order, so resolving
+# a command costs a fixed number of dict lookups however big the world gets.
+
+COMMANDS = {}
+_rules = {}
+ROOM_RULES = {}
+EXIT_GUARDS = {}
+
+def command(*verbs):
+    """Register a handler for the given verbs"""
+    def register(handler):
+        for verb in verbs:
+            COMMANDS[verb] = handler
+        return handler
+    return register
+
+def rule(group, room=None):
+    """Register a rule for a command group, optionally limited to one room"""
+    def register(handler):
+        _rules.setdefault(group, []).append((room, handler))
+        return handler
+    return register
+
+def exit_guard(room, direction):
+    """Register a check that can block leaving a room in a direction"""
+    def register(handler):
+        EXIT_GUARDS[(room, direction)] = handler
+        return handler
+    return register
+
+def apply_rules(group, state, room, verb, obj):
+    """Run the current room's rules for a group until one answers"""
+    for handler in ROOM_RULES.get((state.current_room, group), ()):
+        result = handler(state, room, verb, obj)
+        if result is not None:
+            return result
+    return None
+
+DIRECTIONS = {'n': 'north', 's': 'south', 'e': 'east', 'w': 'west', 'u': 'up', 'd': 'down'}
+
+# Extra words that count as a direction in one room
+ROOM_DIRECTIONS = {
+    'lighthouse_exterior': {'enter': 'north', 'door': 'north', 'lighthouse': 'north'},
+}
+
+ITEM_DESCRIPTIONS = {
+    'driftwood': 'A sturdy piece of driftwood. Could be useful for something.',
+    'rope': 'Strong rope, about 20 feet long.',
+    'crystal_lens': 'A beautiful crystal lens, perfectly shaped to focus light.',
+    'ancient_coin': 'An old coin showing a lighthouse. Perhaps an offering?',
+    'matches': 'A box of matches, still dry.',
+    'apple': 'A small but fresh apple. It looks delicious.',
+    'oil_can': 'A can of lamp oil.',
+    'small_key': 'A brass key with a lighthouse emblem.',
+    'lantern': 'A brass lantern. ',
+    'journal': 'Thomas Blackwood\'s journal. It tells of his eternal vigil for his lost wife Eliza.',
+    'mirror_shard': 'A perfectly polished mirror shard from the well.'
+}
+
+# Item aliases
+ITEM_ALIASES = {
+    'lens': 'crystal_lens',
+    'crystal': 'crystal_lens',
+    'coin': 'ancient_coin',
+    'key': 'small_key',
+    'oil': 'oil_can',
+    'can': 'oil_can',
+    'wood': 'driftwood',
+    'book': 'journal'
+}
+
+def build_noun_index():
+    """Map every examine/item key and alias to the key it names, loading every room"""
+    index = {}
+    for room in ROOMS.values():
+        for key in list(room.get('examine', {})) + list(room.get('items', [])):
+            index[key] = key
+    for alias, key in ITEM_ALIASES.items():
+        if alias in index:
+            raise ValueError(f"alias {alias!r} shadows a room noun")
+        index[alias] = key
+    return index
+
+def build_item_name_index():
+    """Map every fragment of an item's display name to the items containing it"""
+    items = list(ITEM_DESCRIPTIONS)
+    items += [item for item in ITEMS if item not in items]
+    index = {}
+    for item in items:
+        name = item.replace('_', ' ')
+        fragments = {name[i:j] for i in range(len(name)) for j in range(i + 1, len(name) + 1)}
+        for fragment in fragments:
+            index.setdefault(fragment, []).append(item)
+    return {fragment: tuple(items) for fragment, items in index.items()}
+
+ITEM_NAME_INDEX = build_item_name_index()
+
 def parse_command(command, state):
     """Parse and execute player command"""
     command = command.lower().strip()
@@ -733,218 +1476,546 @@ def parse_command(command, state):
     obj = ' '.join(words[1:]) if len(words) > 1 else ''
     obj = obj.replace('the ', '').replace('a ', '').replace('an ', '')
 
-    room = ROOMS[state.current_room]
-
-    # Movement commands
-    if verb in ['go', 'walk', 'move', 'head', 'n', 's', 'e', 'w', 'u', 'd', 'north', 'south', 'east', 'west', 'up', 'down', 'enter']:
-        direction = obj if obj else verb
-        direction_map = {'n': 'north', 's': 'south', 'e': 'east', 'w': 'west', 'u': 'up', 'd': 'down'}
-        direction = direction_map.get(direction, direction)
+    handler = COMMANDS.get(verb)
+    if handler is not None:
+        result = handler(state, ROOMS[state.current_room], verb, obj)
+        if result is not None:
+            return result
 
-        # Special case: entering lighthouse
-        if direction in ['enter', 'door', 'lighthouse'] and state.current_room == 'lighthouse_exterior':
-            direction = 'north'
-
-        # Check for special movement conditions
-        if state.current_room == 'cliffs' and direction == 'north':
-            if not state.flags['crab_moved']:
-                return "The giant crab blocks your path, snapping its claws menacingly!"
+    return f"I don't understand '{command}'. Type HELP for commands."
 
-        if state.current_room == 'lighthouse_exterior' and direction == 'north':
-            if not state.flags['lighthouse_door_open']:
-                return "The lighthouse door is locked. You'll need a key."
+# Movement commands
+@command('go', 'walk', 'move', 'head', 'n', 's', 'e', 'w', 'u', 'd', 'north', 'south', 'east', 'west', 'up', 'down', 'enter')
+def do_go(state, room, verb, obj):
+    direction = obj if obj else verb
+    direction = DIRECTIONS.get(direction, direction)
+    direction = ROOM_DIRECTIONS.get(state.current_room, {}).get(direction, direction)
+
+    # Check for special movement conditions
+    guard = EXIT_GUARDS.get((state.current_room, direction))
+    if guard is not None:
+        blocked = guard(state)
+        if blocked:
+            return blocked
+
+    if direction in room['exits']:
+        state.current_room = room['exits'][direction]
+        new_room = ROOMS.enter(state.current_room)
+        return new_room['description']
+    else:
+        return "You can't go that way."
 
-        if direction in room['exits']:
-            state.current_room = room['exits'][direction]
-            new_room = ROOMS[state.current_room]
-            return new_room['description']
-        else:
-            return "You can't go that way."
-
-    # Look command
-    if verb in ['look', 'l', 'examine', 'x', 'inspect', 'read']:
-        if not obj or obj in ['around', 'room']:
-            return room['description']
-
-        # Check examine dictionary
-        obj_key = obj.replace(' ', '_')
-        if obj_key in room.get('examine', {}):
-            if obj_key == 'journal':
-                state.flags['read_journal'] = True
-            return room['examine'][obj_key]
-
-        # Check inventory items
-        for item in state.inventory:
-            if obj in item.replace('_', ' '):
-                item_descs = {
-                    'driftwood': 'A sturdy piece of driftwood. Could be useful for something.',
-                    'rope': 'Strong rope, about 20 feet long.',
-                    'crystal_lens': 'A beautiful crystal lens, perfectly shaped to focus light.',
-                    'ancient_coin': 'An old coin showing a lighthouse. Perhaps an offering?',
-                    'matches': 'A box of matches, still dry.',
-                    'apple': 'A small but fresh apple. It looks delicious.',
-                    'oil_can': 'A can of lamp oil.',
-                    'small_key': 'A brass key with a lighthouse emblem.',
-                    'lantern': 'A brass lantern. ' + ('It glows with a warm flame.' if state.flags['lantern_lit'] else 'It needs oil and a flame.'),
-                    'journal': 'Thomas Blackwood\'s journal. It tells of his eternal vigil for his lost wife Eliza.',
-                    'mirror_shard': 'A perfectly polished mirror shard from the well.'
-                }
-                return item_descs.get(item, f"It's a {item.replace('_', ' ')}.")
-
-        return f"You don't see any {obj} here."
-
-    # Get/take command
-    if verb in ['get', 'take', 'grab', 'pick', 'pickup']:
-        obj_key = obj.replace(' ', '_')
-
-        # Special: dig in sand
-        if obj in ['sand', 'mirror', 'shard', 'mirror shard'] and state.current_room == 'beach':
-            if 'mirror_shard' not in state.inventory:
-                state.add_to_inventory('mirror_shard')
-                return "You dig in the sand near the waterline and find a perfectly polished mirror shard!"
-
-        # Check room items
-        if obj_key in room.get('items', []):
-            state.add_to_inventory(obj_key)
-            room['items'].remove(obj_key)
-            return f"You take the {obj.replace('_', ' ')}."
-
-        # Item aliases
-        aliases = {
-            'lens': 'crystal_lens',
-            'crystal': 'crystal_lens',
-            'coin': 'ancient_coin',
-            'key': 'small_key',
-            'oil': 'oil_can',
-            'can': 'oil_can',
-            'wood': 'driftwood',
-            'book': 'journal'
-        }
-        if obj in aliases and aliases[obj] in room.get('items', []):
-            item = aliases[obj]
-            state.add_to_inventory(item)
-            room['items'].remove(item)
-            return f"You take the {item.replace('_', ' ')}."
-
-        return f"You can't take that."
-
-    # Use/put command
-    if verb in ['use', 'put', 'place', 'insert', 'install', 'combine', 'give', 'throw', 'feed']:
-        # Use key on door
-        if ('key' in obj or 'small_key' in obj) and state.current_room == 'lighthouse_exterior':
-            if state.has_item('small_key'):
-                state.flags['lighthouse_door_open'] = True
-                return "The key fits! The heavy door swings open with a groan, revealing the dark interior."
-            return "You don't have a key."
-
-        # Use oil on lantern
-        if 'oil' in obj and 'lantern' in obj:
-            if state.has_item('oil_can') and state.has_item('lantern'):
-                state.remove_item('oil_can')
-                return "You fill the lantern with oil. Now you just need to light it."
-            return "You need both the oil can and the lantern."
-
-        if 'oil' in obj and state.has_item('oil_can') and state.has_item('lantern'):
+@exit_guard('cliffs', 'north')
+def crab_blocks_cave(state):
+    if not state.flags['crab_moved']:
+        return "The giant crab blocks your path, snapping its claws menacingly!"
+
+@exit_guard('lighthouse_exterior', 'north')
+def lighthouse_door_locked(state):
+    if not state.flags['lighthouse_door_open']:
+        return "The lighthouse door is locked. You'll need a key."
+
+# Look command
+@command('look', 'l', 'examine', 'x', 'inspect', 'read')
+def do_look(state, room, verb, obj):
+    if not obj or obj in ['around', 'room']:
+        return room['description']
+
+    # Check examine dictionary
+    obj_key = obj.replace(' ', '_')
+    if obj_key in room.get('examine', {}):
+        if obj_key == 'journal':
+            state.flags['read_journal'] = True
+        return room['examine'][obj_key]
+
+    # Check inventory items, first match in inventory order
+    inventory = state.inventory
+    carried = [item for item in ITEM_NAME_INDEX.get(obj, ()) if item in inventory]
+    if carried:
+        item = min(carried, key=inventory.index)
+        description = ITEM_DESCRIPTIONS.get(item, f"It's a {item.replace('_', ' ')}.")
+        if item == 'lantern':
+            description += 'It glows with a warm flame.' if state.flags['lantern_lit'] else 'It needs oil and a flame.'
+        return description
+
+    return f"You don't see any {obj} here."
+
+# Get/take command
+@command('get', 'take', 'grab', 'pick', 'pickup')
+def do_get(state, room, verb, obj):
+    result = apply_rules('get', state, room, verb, obj)
+    if result is not None:
+        return result
+
+    # Check room items, by name or alias
+    key = obj.replace(' ', '_')
+    item = ITEM_ALIASES.get(key, key)
+    if state.world.take_item(state.current_room, item):
+        state.add_to_inventory(item)
+        return f"You take the {item.replace('_', ' ')}."
+
+    return f"You can't take that."
+
+# Special: dig in sand
+@rule('get', 'beach')
+def get_mirror_shard(state, room, verb, obj):
+    if obj in ['sand', 'mirror', 'shard', 'mirror shard']:
+        if not state.has_item('mirror_shard'):
+            state.add_to_inventory('mirror_shard')
+            return "You dig in the sand near the waterline and find a perfectly polished mirror shard!"
+
+# Use/put command
+@command('use', 'put', 'place', 'insert', 'install', 'combine', 'give', 'throw', 'feed')
+def do_use(state, room, verb, obj):
+    result = apply_rules('use', state, room, verb, obj)
+    if result is not None:
+        return result
+    return f"You can't use that here."
+
+# Use key on door
+@rule('use', 'lighthouse_exterior')
+def use_key(state, room, verb, obj):
+    if 'key' in obj or 'small_key' in obj:
+        if state.has_item('small_key'):
+            state.flags['lighthouse_door_open'] = True
+            return "The key fits! The heavy door swings open with a groan, revealing the dark interior."
+        return "You don't have a key."
+
+# Use oil on lantern
+@rule('use')
+def use_oil_on_lantern(state, room, verb, obj):
+    if 'oil' in obj and 'lantern' in obj:
+        if state.has_item('oil_can') and state.has_item('lantern'):
             state.remove_item('oil_can')
             return "You fill the lantern with oil. Now you just need to light it."
-
-        # Light lantern with matches
-        if ('match' in obj or 'light' in verb) and ('lantern' in obj or state.has_item('lantern')):
-            if state.has_item('matches') and state.has_item('lantern'):
-                if not state.flags.get('lantern_has_oil', False) and state.has_item('oil_can'):
-                    return "The lantern needs oil first."
-                state.flags['lantern_lit'] = True
-                state.remove_item('matches')
-                return "You strike a match and light the lantern. It casts a warm, steady glow."
-            return "You need matches and a lantern."
-
-        # Throw driftwood/apple at crab
-        if state.current_room == 'cliffs' and ('crab' in obj or obj in ['driftwood', 'wood', 'apple']):
-            if state.has_item('apple'):
-                state.remove_item('apple')
-                state.flags['crab_moved'] = True
-                return "You toss the apple away from the cave. The crab scuttles after it eagerly! The path to the cave is now clear."
-            if state.has_item('driftwood'):
-                return "You wave the driftwood at the crab but it just snaps at it angrily. Maybe food would work better?"
-            return "You have nothing to distract the crab with."
-
-        # Place lens in housing
-        if ('lens' in obj or 'crystal' in obj) and state.current_room == 'light_chamber':
-            if state.has_item('crystal_lens'):
-                state.remove_item('crystal_lens')
-                state.flags['lens_installed'] = True
-                return "You carefully place the crystal lens into the housing. It fits perfectly! Now if only there was light to focus..."
-            return "You don't have the crystal lens."
-
-        # Place mirror in bracket
-        if ('mirror' in obj or 'shard' in obj) and state.current_room == 'light_chamber':
-            if state.has_item('mirror_shard'):
-                state.remove_item('mirror_shard')
-                state.flags['mirror_placed'] = True
-                return "You place the mirror shard in the empty bracket. It fits perfectly, as if it was always meant to be here."
-            return "You don't have the mirror shard."
-
-        # Light the lighthouse
-        if 'lantern' in obj and state.current_room == 'light_chamber':
-            if state.has_item('lantern') and state.flags['lantern_lit']:
-                if state.flags['lens_installed'] and state.flags['mirror_placed']:
-                    state.flags['lighthouse_lit'] = True
-                    return light_the_lighthouse(state)
-                elif not state.flags['lens_installed']:
-                    return "You hold the lantern up but without a lens, the light won't focus properly."
-                else:
-                    return "You hold the lantern up but one of the mirror brackets is empty. The light won't reach far enough."
-            return "You need a lit lantern to light the lighthouse."
-
-        # Give coin to ghost
-        if ('coin' in obj or 'ghost' in obj) and state.current_room == 'path':
-            if state.has_item('ancient_coin'):
-                state.remove_item('ancient_coin')
-                state.flags['talked_to_ghost'] = True
-                return "You offer the ancient coin to the ghost. She takes it, and for a moment becomes solid. 'Thank you, kind sailor. My husband Thomas kept this lighthouse for me. Find the lens in the sea cave, the mirror where you woke, and reunite us.' She fades, but you feel her gratitude."
-            return "You have nothing to give."
-
-        return f"You can't use that here."
-
-    # Talk command
-    if verb in ['talk', 'speak', 'ask', 'greet', 'hello', 'hi']:
-        if state.current_room == 'path':
-            if not state.flags['talked_to_ghost']:
-                return "The ghost turns to you, her eyes filled with centuries of sorrow. 'Please... help us. My husband waits above, the light waits to shine again. Do you have an offering?'"
+        return "You need both the oil can and the lantern."
+
+@rule('use')
+def use_oil(state, room, verb, obj):
+    if 'oil' in obj and state.has_item('oil_can') and state.has_item('lantern'):
+        state.remove_item('oil_can')
+        return "You fill the lantern with oil. Now you just need to light it."
+
+# Light lantern with matches
+@rule('use')
+def use_matches(state, room, verb, obj):
+    if ('match' in obj or 'light' in verb) and ('lantern' in obj or state.has_item('lantern')):
+        if state.has_item('matches') and state.has_item('lantern'):
+            if not state.flags.get('lantern_has_oil', False) and state.has_item('oil_can'):
+                return "The lantern needs oil first."
+            state.flags['lantern_lit'] = True
+            state.remove_item('matches')
+            return "You strike a match and light the lantern. It casts a warm, steady glow."
+        return "You need matches and a lantern."
+
+# Throw driftwood/apple at crab
+@rule('use', 'cliffs')
+def use_on_crab(state, room, verb, obj):
+    if 'crab' in obj or obj in ['driftwood', 'wood', 'apple']:
+        if state.has_item('apple'):
+            state.remove_item('apple')
+            state.flags['crab_moved'] = True
+            return "You toss the apple away from the cave. The crab scuttles after it eagerly! The path to the cave is now clear."
+        if state.has_item('driftwood'):
+            return "You wave the driftwood at the crab but it just snaps at it angrily. Maybe food would work better?"
+        return "You have nothing to distract the crab with."
+
+# Place lens in housing
+@rule('use', 'light_chamber')
+def use_lens(state, room, verb, obj):
+    if 'lens' in obj or 'crystal' in obj:
+        if state.has_item('crystal_lens'):
+            state.remove_item('crystal_lens')
+            state.flags['lens_installed'] = True
+            return "You carefully place the crystal lens into the housing. It fits perfectly! Now if only there was light to focus..."
+        return "You don't have the crystal lens."
+
+# Place mirror in bracket
+@rule('use', 'light_chamber')
+def use_mirror(state, room, verb, obj):
+    if 'mirror' in obj or 'shard' in obj:
+        if state.has_item('mirror_shard'):
+            state.remove_item('mirror_shard')
+            state.flags['mirror_placed'] = True
+            return "You place the mirror shard in the empty bracket. It fits perfectly, as if it was always meant to be here."
+        return "You don't have the mirror shard."
+
+# Light the lighthouse
+@rule('use', 'light_chamber')
+def use_lantern(state, room, verb, obj):
+    if 'lantern' in obj:
+        if state.has_item('lantern') and state.flags['lantern_lit']:
+            if state.flags['lens_installed'] and state.flags['mirror_placed']:
+                state.flags['lighthouse_lit'] = True
+                return light_the_lighthouse(state)
+            elif not state.flags['lens_installed']:
+                return "You hold the lantern up but without a lens, the light won't focus properly."
             else:
-                return "'Light reunites what darkness divides. Please, restore the lighthouse.'"
-        return "There's no one here to talk to."
-
-    # Ring bell
-    if verb in ['ring', 'pull'] and state.current_room == 'lighthouse_exterior':
-        if 'bell' in obj or 'rope' in obj:
-            state.flags['bell_rung'] = True
-            return "You pull the rope and the bell rings out across the island. BONG... BONG... BONG... The sound echoes hauntingly. For a moment, you hear distant voices carried on the wind."
-
-    # Dig command
-    if verb in ['dig', 'search']:
-        if state.current_room == 'beach' and 'mirror_shard' not in state.inventory:
-            state.add_to_inventory('mirror_shard')
-            return "You dig in the sand near the waterline and discover a perfectly polished mirror shard, glinting in the dim light!"
-        return "You find nothing of interest."
-
-    # Inventory
-    if verb in ['inventory', 'inv', 'i']:
-        if state.inventory:
-            items = [i.replace('_', ' ') for i in state.inventory]
-            return "You are carrying: " + ', '.join(items)
-        return "You aren't carrying anything."
-
-    # Help
-    if verb in ['help', 'h', '?']:
-        return "Commands: LOOK, GET, USE, TALK, GO (N/S/E/W/UP/DOWN), INVENTORY. Type LOOK <object> to examine things."
-
-    # Quit
-    if verb in ['quit', 'exit', 'q']:
-        pygame.quit()
-        sys.exit()
-
-    return f"I don't understand '{command}'. Type HELP for commands."
+                return "You hold the lantern up but one of the mirror brackets is empty. The light won't reach far enough."
+        return "You need a lit lantern to light the lighthouse."
+
+# Give coin to ghost
+@rule('use', 'path')
+def give_coin(state, room, verb, obj):
+    if 'coin' in obj or 'ghost' in obj:
+        if state.has_item('ancient_coin'):
+            state.remove_item('ancient_coin')
+            state.flags['talked_to_ghost'] = True
+            return "You offer the ancient coin to the ghost. She takes it, and for a moment becomes solid. 'Thank you, kind sailor. My husband Thomas kept this lighthouse for me. Find the lens in the sea cave, the mirror where you woke, and reunite us.' She fades, but you feel her gratitude."
+        return "You have nothing to give."
+
+# Talk command
+@command('talk', 'speak', 'ask', 'greet', 'hello', 'hi')
+def do_talk(state, room, verb, obj):
+    result = apply_rules('talk', state, room, verb, obj)
+    if result is not None:
+        return result
+    return "There's no one here to talk to."
+
+@rule('talk', 'path')
+def talk_to_ghost(state, room, verb, obj):
+    if not state.flags['talked_to_ghost']:
+        return "The ghost turns to you, her eyes filled with centuries of sorrow. 'Please... help us. My husband waits above, the light waits to shine again. Do you have an offering?'"
+    else:
+        return "'Light reunites what darkness divides. Please, restore the lighthouse.'"
+
+# Ring bell
+@command('ring', 'pull')
+def do_ring(state, room, verb, obj):
+    return apply_rules('ring', state, room, verb, obj)
+
+@rule('ring', 'lighthouse_exterior')
+def ring_bell(state, room, verb, obj):
+    if 'bell' in obj or 'rope' in obj:
+        state.flags['bell_rung'] = True
+        return "You pull the rope and the bell rings out across the island. BONG... BONG... BONG... The sound echoes hauntingly. For a moment, you hear distant voices carried on the wind."
+
+# Dig command
+@command('dig', 'search')
+def do_dig(state, room, verb, obj):
+    result = apply_rules('dig', state, room, verb, obj)
+    if result is not None:
+        return result
+    return "You find nothing of interest."
+
+@rule('dig', 'beach')
+def dig_sand(state, room, verb, obj):
+    if not state.has_item('mirror_shard'):
+        state.add_to_inventory('mirror_shard')
+        return "You dig in the sand near the waterline and discover a perfectly polished mirror shard, glinting in the dim light!"
+
+# Inventory
+@command('inventory', 'inv', 'i')
+def do_inventory(state, room, verb, obj):
+    if state.inventory:
+        items = [i.replace('_', ' ') for i in state.inventory]
+        return "You are carrying: " + ', '.join(items)
+    return "You aren't carrying anything."
+
+# Help
+@command('help', 'h', '?')
+def do_help(state, room, verb, obj):
+    return "Commands: LOOK, GET, USE, TALK, GO (N/S/E/W/UP/DOWN), INVENTORY. Type LOOK <object> to examine things."
+
+class QuitGame(SystemExit):
+    """Raised by the quit command; ends the game unless a host catches it"""
+
+# Quit
+@command('quit', 'exit', 'q')
+def do_quit(state, room, verb, obj):
+    raise QuitGame()
+
+def compile_rules():
+    """Resolve the registered rules into per-room lists, keeping their order"""
+    ROOM_RULES.clear()
+    for group, rules in _rules.items():
+        for room_id in ROOMS:
+            ROOM_RULES[(room_id, group)] = tuple(
+                handler for room, handler in rules if room in (None, room_id))
+
+compile_rules()
+
+WALKTHROUGH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'WALKTHROUGH.txt')
+
+def load_walkthrough(path=WALKTHROUGH_PATH):
+    """Extract the solution command stream from the walkthrough"""
+    commands = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith('- Type: '):
+                continue
+            # Commands are in capitals, followed by lower case commentary
+            # or "(or ...)" alternatives
+            command = []
+            for word in line[len('- Type: '):].split():
+                if not word.isupper():
+                    break
+                command.append(word)
+            commands.append(' '.join(command))
+    return commands
+
+# Journals are JSON lines, one per command, written as they are entered so
+# a crash loses nothing. Every session starts from the same state, so the
+# commands alone replay it.
+def open_journal(path, append=False):
+    """Start a journal file for a session, or carry on with one"""
+    return open(path, 'a' if append else 'w')
+
+def write_journal_entry(f, command):
+    f.write(json.dumps({'command': command}) + "\n")
+    f.flush()
+
+def read_journal(lines):
+    """Yield the commands in journal lines, as they are read
+
+    Lines without a command, like the seed header older journals start
+    with, are skipped.
+    """
+    for line in lines:
+        if line.strip():
+            entry = json.loads(line)
+            if 'command' in entry:
+                yield entry['command']
+
+# Saved games
+#
+# Sessions are autosaved to a snapshot file after every command that
+# changes their state_key(). Saving only packs the state into a record and
+# files it under the session's id, so the game loop never waits on the
+# disk; a writer thread wakes up, lets a burst of commands settle for
+# SAVE_DELAY seconds, then writes every session's latest record to a
+# temporary file and renames it over the snapshot. A crash at any point
+# leaves either the old snapshot or the new one, never a torn file.
+# Sessions that haven't changed for a while can be set to expire, so a
+# server's snapshot doesn't grow with every player who never came back.
+#
+# The file is a header, then one record per session: a fixed struct of when
+# it was saved, the bitsets and the lengths of what follows, which is the
+# session id and room id as UTF-8, the pickup order as one byte per item
+# and the last message as UTF-8. Item and flag bits are stable (new ones
+# are appended), so snapshots outlive changes to the world. Loading only splits the file
+# into records by id; a state is unpacked when its session comes back.
+
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lighthouse.sav')
+SAVE_MAGIC = b'LHSAVE02'
+SAVE_HEADER = struct.Struct('<8sI')        # magic, record count
+SAVE_RECORD = struct.Struct('<IQQQBBBH')   # saved at, inventory, flags, taken; id, room, order, message lengths
+SAVE_ID_MAX = 255                          # bytes of UTF-8
+SAVE_DELAY = 0.5
+
+def pack_state(session_id, state, saved_at):
+    """One snapshot record for a session
+
+    Raises ValueError if the session can't be saved: an id longer than
+    SAVE_ID_MAX, or more items or flags than the record has bits for.
+    """
+    session = session_id.encode()
+    room = state.current_room.encode()
+    message = state.message.encode()[:0xffff]
+    try:
+        order = bytes(state.pickup_order)
+        return (SAVE_RECORD.pack(int(saved_at), state.inventory_bits, state.flag_bits, state.world.taken,
+                                 len(session), len(room), len(order), len(message))
+                + session + room + order + message)
+    except (struct.error, ValueError) as e:
+        raise ValueError(f"can't save session {session_id[:20]!r}: {e}") from None
+
+def unpack_state(record):
+    """Rebuild a GameState from pack_state(), or None if its room is gone"""
+    _, inventory, flags, taken, session_size, room_size, order_size, message_size = SAVE_RECORD.unpack_from(record)
+    start = SAVE_RECORD.size + session_size
+    room = record[start:start + room_size].decode()
+    if room not in ROOMS:
+        return None
+    state = GameState.from_key((room, inventory, flags, taken))
+    start += room_size
+    state.pickup_order = tuple(index for index in record[start:start + order_size] if index < len(ITEMS))
+    start += order_size
+    state.message = record[start:start + message_size].decode('utf-8', 'replace')
+    return state
+
+def read_snapshot(path):
+    """Return {session id: record} from a snapshot file, empty if there is none
+
+    A file that isn't a snapshot, or is cut short, raises ValueError.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+    try:
+        magic, count = SAVE_HEADER.unpack_from(data)
+        if magic != SAVE_MAGIC:
+            raise ValueError(f"{path} is not a saved game")
+        records = {}
+        offset = SAVE_HEADER.size
+        for _ in range(count):
+            *_, session_size, room_size, order_size, message_size = SAVE_RECORD.unpack_from(data, offset)
+            start = offset + SAVE_RECORD.size
+            end = start + session_size + room_size + order_size + message_size
+            if end > len(data):
+                raise ValueError(f"{path} is cut short")
+            records[data[start:start + session_size].decode()] = data[offset:end]
+            offset = end
+    except struct.error:
+        raise ValueError(f"{path} is cut short") from None
+    return records
+
+class Autosaver:
+    """Keeps a snapshot file up to date from a background writer thread
+
+    save() and discard() only update the in-memory records and wake the
+    writer; close() writes whatever is still pending and stops it. With
+    expire_after, sessions not saved for that many seconds are dropped
+    when the snapshot is read and whenever it is written.
+    """
+    def __init__(self, path, delay=SAVE_DELAY, expire_after=None):
+        self.path = path
+        self.delay = delay
+        self.expire_after = expire_after
+        self.records = read_snapshot(path)
+        self.lock = threading.Lock()      # guards records and dirty
+        self.dirty = self.expire()
+        self.wake = threading.Event()
+        self.closing = False
+        self.thread = threading.Thread(target=self.write_loop, name='autosave', daemon=True)
+        self.thread.start()
+
+    def __contains__(self, session_id):
+        return session_id in self.records
+
+    def restore(self, session_id=''):
+        """The saved state of a session, or None"""
+        record = self.records.get(session_id)
+        return unpack_state(record) if record else None
+
+    def save(self, state, session_id=''):
+        """File a session's state for the next write, returning whether it could be saved"""
+        try:
+            record = pack_state(session_id, state, time.time())
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return False
+        with self.lock:
+            self.records[session_id] = record
+            self.dirty = True
+        self.wake.set()
+        return True
+
+    def discard(self, session_id=''):
+        with self.lock:
+            if self.records.pop(session_id, None) is None:
+                return
+            self.dirty = True
+        self.wake.set()
+
+    def write_loop(self):
+        while not self.closing:
+            self.wake.wait()
+            # Let a burst of commands settle into one write
+            time.sleep(self.delay)
+            self.wake.clear()
+            try:
+                self.write()
+            except OSError as e:
+                # Keep playing; the next save tries again
+                print(f"Autosave to {self.path} failed: {e}", file=sys.stderr)
+                with self.lock:
+                    self.dirty = True
+
+    def expire(self):
+        """Drop sessions saved longer than expire_after ago, returning whether there were any"""
+        if self.expire_after is None:
+            return False
+        cutoff = time.time() - self.expire_after
+        expired = [session_id for session_id, record in self.records.items()
+                   if SAVE_RECORD.unpack_from(record)[0] < cutoff]
+        for session_id in expired:
+            del self.records[session_id]
+        return bool(expired)
+
+    def write(self):
+        """Write the snapshot if anything changed since the last write"""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            self.expire()
+            records = list(self.records.values())
+        temp = self.path + '.tmp'
+        with open(temp, 'wb') as f:
+            f.write(SAVE_HEADER.pack(SAVE_MAGIC, len(records)))
+            f.write(b''.join(records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+
+    def close(self):
+        self.closing = True
+        self.wake.set()
+        self.thread.join()
+        self.write()
+
+# Scripted play
+#
+# Bots and CI drive the parser directly, one command per line, at parser
+# speed. Nothing here initializes pygame or opens a window.
+
+def run_commands(commands, state=None):
+    """Run commands against a state, yielding a result dict as each one finishes
+
+    A quit command ends the run; its result has a response of None.
+    """
+    state = GameState() if state is None else state
+    for command in commands:
+        try:
+            response = parse_command(command, state)
+        except QuitGame:
+            response = None
+        else:
+            state.message = response
+        yield {'command': command, 'response': response, 'room': state.current_room,
+               'flags': [flag for flag, value in state.flags.items() if value],
+               'inventory': state.inventory}
+        if response is None:
+            return
+
+def run_script(path, output_format='text', journal_path=None):
+    """Run commands from a file, or stdin for '-', streaming results to stdout
+
+    text output is a transcript ("> command", then the response); jsonl
+    output is one result from run_commands() per line.
+    """
+    from_stdin = path == '-'
+    source = sys.stdin if from_stdin else open(path)
+    state = GameState()
+    journal = open_journal(journal_path) if journal_path else None
+
+    def commands():
+        for line in source:
+            command = line.rstrip('\r\n')
+            if journal:
+                write_journal_entry(journal, command)
+            yield command
+
+    try:
+        for result in run_commands(commands(), state=state):
+            if output_format == 'jsonl':
+                sys.stdout.write(json.dumps(result) + "\n")
+            elif result['response'] is None:
+                sys.stdout.write(f"> {result['command']}\n")
+            else:
+                sys.stdout.write(f"> {result['command']}\n{result['response']}\n\n")
+            if from_stdin:
+                # Whoever is feeding stdin may be waiting on this reply
+                sys.stdout.flush()
+    finally:
+        if journal:
+            journal.close()
+        if not from_stdin:
+            source.close()
 
 def light_the_lighthouse(state):
     """The winning sequence"""
@@ -1000,90 +2071,656 @@ def draw_win_screen(surface, state):
     # Ground
     draw_pixel_rect(surface, 'green', 0, 120, 320, 40)
 
-def main():
-    """Main game loop"""
+def draw_title_art(surface, beams):
+    """Draw everything on the title screen but the stars"""
+    draw_pixel_rect(surface, 'black', 0, 0, 320, 200)
+
+    # Lighthouse silhouette
+    draw_pixel_rect(surface, 'dark_gray', 135, 60, 50, 100)
+    draw_pixel_rect(surface, 'yellow', 150, 50, 20, 15)
+
+    # Light beams
+    if beams:
+        pygame.draw.line(surface, EGA_COLORS['yellow'], (160, 55), (80, 20), 2)
+        pygame.draw.line(surface, EGA_COLORS['yellow'], (160, 55), (240, 20), 2)
+
+    # Title text
+    title1 = render_text(font_medium, "THE LIGHTHOUSE", 'light_cyan')
+    title2 = render_text(font_medium, "OF FORGOTTEN SOULS", 'light_cyan')
+    surface.blit(title1, (95, 10))
+    surface.blit(title2, (80, 28))
+
+    # Instructions
+    inst1 = render_text(font_small, "A Sierra-Style Adventure", 'white')
+    inst2 = render_text(font_small, "Press any key to begin...", 'yellow')
+    surface.blit(inst1, (95, 170))
+    surface.blit(inst2, (95, 185))
+
+def draw_title_screen(surface, title_timer):
+    """Draw the title screen"""
+    beams = title_timer % 30 < 15
+    if not blit_baked(surface, title_asset_name(beams)):
+        draw_title_art(surface, beams)
+
+    # Stars
+    for i in range(30):
+        x = (i * 37 + title_timer) % 320
+        y = (i * 13) % 50
+        draw_pixel(surface, 'white', x, y)
+
+def render_frame(surface, state, input_text, showing_title=False, title_timer=0,
+                 profiler=None, walker=None):
+    """Compose one complete frame on the game surface"""
+    # Clear game surface
+    surface.fill(EGA_COLORS['black'])
+
+    if showing_title:
+        draw_title_screen(surface, title_timer)
+        if profiler:
+            profiler.mark('scene')
+        return
+
+    if state.flags['game_won']:
+        if not blit_baked(surface, 'win'):
+            draw_win_screen(surface, state)
+    else:
+        # Draw current scene
+        draw_cached_scene(surface, state)
+        if walker:
+            draw_morgan(surface, walker.signature())
+    if profiler:
+        profiler.mark('scene')
+    draw_ui(surface, state, input_text)
+    if profiler:
+        profiler.mark('ui')
+
+# Regions of game_surface that change independently, used to present only
+# the parts of the frame that differ from what is already on screen
+FULL_RECT = pygame.Rect(0, 0, GAME_WIDTH, GAME_HEIGHT)
+SCENE_RECT = pygame.Rect(0, 0, GAME_WIDTH, 160)
+INVENTORY_RECT = pygame.Rect(240, 0, 80, 45)
+ROOM_NAME_RECT = pygame.Rect(0, 160, GAME_WIDTH, 15)
+MESSAGE_RECT = pygame.Rect(0, 175, GAME_WIDTH, 25)
+INPUT_RECT = pygame.Rect(0, 193, GAME_WIDTH, 7)
+
+FRAME_REGIONS = {
+    'scene': SCENE_RECT,
+    'inventory': INVENTORY_RECT,
+    'room_name': ROOM_NAME_RECT,
+    'message': MESSAGE_RECT,
+    'input': INPUT_RECT,
+}
+
+def frame_signature(state, input_text, showing_title, title_timer, walker=None):
+    """Summarize what each screen region shows this frame"""
+    if showing_title:
+        # Stars scroll every frame, so the whole title screen changes
+        return {'title': title_timer}
+
+    if state.flags['game_won']:
+        scene = 'won'
+    else:
+        scene = scene_key(state)
+    signature = {
+        'scene': scene,
+        'inventory': state.inventory,
+        'room_name': state.current_room,
+        'message': state.message,
+        'input': input_text,
+    }
+    if walker and scene != 'won':
+        signature['sprite'] = walker.signature()
+    return signature
+
+def dirty_regions(previous, current):
+    """List the game_surface rects whose contents changed between frames"""
+    if previous is None or previous.keys() != current.keys() or 'title' in current:
+        return [FULL_RECT] if previous != current else []
+    rects = []
+    for name in current:
+        if previous[name] == current[name]:
+            continue
+        if name == 'sprite':
+            # Where Morgan was and where he is now
+            rects.append(sprite_rect(previous[name]).union(sprite_rect(current[name])))
+        else:
+            rects.append(FRAME_REGIONS[name])
+    return rects
+
+def only_sprite_moved(previous, current):
+    """Whether Morgan is all that changed between two frame signatures"""
+    return (previous is not None and previous.keys() == current.keys() and 'sprite' in current
+            and all(previous[name] == current[name] for name in current if name != 'sprite'))
+
+SCALE_MODES = ('integer', 'fit', 'fullscreen', 'sdl')
+UPSCALERS = ('scale2x',)
+
+class Presenter:
+    """Puts game_surface on the display without per-frame allocations
+
+    Scale modes:
+      integer     window of exactly scale x the game size; dirty rects are
+                  scaled straight into matching screen subsurfaces
+      fit         resizable window; the frame is scaled as large as fits,
+                  keeping its aspect ratio, into a letterboxed area
+      fullscreen  like fit, on a fullscreen display
+      sdl         320x200 display opened with pygame.SCALED so SDL does the
+                  scaling; frames are only copied 1:1
+
+    The scale2x upscaler runs pygame's Scale2x filter over the whole frame
+    into a preallocated double-size buffer before the final scale.
+    Every surface used while presenting is created when the mode is set,
+    so steady-state frames allocate nothing.
+
+    An 8-bit game_surface is scaled as palette indices into an 8-bit
+    buffer, and the palette is applied when that is copied to the screen.
+    Color cycling just changes the buffer's palette and copies it again.
+    """
+    def __init__(self, mode='integer', scale=SCALE, upscaler=None):
+        if mode not in SCALE_MODES:
+            raise ValueError(f"unknown scale mode {mode!r}")
+        if upscaler not in (None,) + UPSCALERS:
+            raise ValueError(f"unknown upscaler {upscaler!r}")
+        self.scale = scale
+        self.upscaler = upscaler
+        self.indexed = game_surface.get_bitsize() == 8
+        self.palette_step = 0
+        self.windowed_mode = mode if mode != 'fullscreen' else 'integer'
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """Open the display for a scale mode and preallocate its buffers"""
+        global screen
+        self.mode = mode
+        if mode == 'integer':
+            screen = pygame.display.set_mode((GAME_WIDTH * self.scale, GAME_HEIGHT * self.scale))
+        elif mode == 'fit':
+            screen = pygame.display.set_mode((GAME_WIDTH * self.scale, GAME_HEIGHT * self.scale),
+                                             pygame.RESIZABLE)
+        elif mode == 'fullscreen':
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            try:
+                screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT), pygame.SCALED)
+            except pygame.error:
+                # SCALED needs an SDL renderer; software-only drivers lack one
+                self.set_mode('integer')
+                return
+        self.layout()
+
+    def toggle_fullscreen(self):
+        if self.mode == 'fullscreen':
+            self.set_mode(self.windowed_mode)
+        else:
+            self.windowed_mode = self.mode
+            self.set_mode('fullscreen')
+
+    def resize(self):
+        """Pick up a new window size after a resize event"""
+        global screen
+        screen = pygame.display.get_surface()
+        self.layout()
+
+    def layout(self):
+        """Work out where the frame goes on screen and allocate buffers"""
+        width, height = screen.get_size()
+        if self.mode == 'sdl':
+            factor = 1
+        elif self.mode == 'integer':
+            factor = self.scale
+        else:
+            factor = min(width / GAME_WIDTH, height / GAME_HEIGHT)
+            if factor == int(factor):
+                factor = int(factor)
+
+        self.target = pygame.Rect(0, 0, int(GAME_WIDTH * factor), int(GAME_HEIGHT * factor))
+        self.target.center = (width // 2, height // 2)
+        self.target_surface = screen.subsurface(self.target)
+        # Dirty rects only map cleanly onto the screen at whole-number scales
+        self.factor = factor if isinstance(factor, int) and not self.upscaler else None
+        self.regions = {}
+
+        self.upscale_buffer = None
+        if self.upscaler == 'scale2x':
+            self.upscale_buffer = new_surface((GAME_WIDTH * 2, GAME_HEIGHT * 2),
+                                              game_surface if self.indexed else screen)
+
+        self.index_buffer = None
+        if self.indexed:
+            self.index_buffer = new_surface(self.target.size, game_surface)
+            self.index_buffer.set_palette(palette_at(self.palette_step))
+
+        # Letterbox borders stay black; everything is redrawn after a layout
+        screen.fill(EGA_COLORS['black'])
+
+    def region(self, rect):
+        """Source and destination subsurfaces for a dirty rect, made once"""
+        key = tuple(rect)
+        pair = self.regions.get(key)
+        if pair is None:
+            f = self.factor
+            scaled = pygame.Rect(rect.x * f, rect.y * f, rect.width * f, rect.height * f)
+            target = scaled.move(self.target.topleft)
+            buffer = self.index_buffer.subsurface(scaled) if self.indexed else None
+            pair = (game_surface.subsurface(rect), buffer, screen.subsurface(target), target)
+            self.regions[key] = pair
+        return pair
+
+    def present(self, rects, profiler=None):
+        """Scale the given game_surface rects onto the screen and push them"""
+        if self.factor is None:
+            # Fractional scales and upscalers work on the whole frame
+            source = game_surface
+            if self.upscale_buffer is not None:
+                pygame.transform.scale2x(game_surface, self.upscale_buffer)
+                source = self.upscale_buffer
+            if self.indexed:
+                pygame.transform.scale(source, self.target.size, self.index_buffer)
+                self.target_surface.blit(self.index_buffer, (0, 0))
+            else:
+                pygame.transform.scale(source, self.target.size, self.target_surface)
+            updated = [self.target]
+        else:
+            updated = []
+            for rect in rects:
+                source, buffer, destination, target = self.region(rect)
+                if buffer is not None:
+                    pygame.transform.scale(source, target.size, buffer)
+                    destination.blit(buffer, (0, 0))
+                elif self.factor == 1:
+                    destination.blit(source, (0, 0))
+                else:
+                    pygame.transform.scale(source, target.size, destination)
+                updated.append(target)
+        if profiler:
+            profiler.mark('scale')
+        pygame.display.update(updated)
+        if profiler:
+            profiler.mark('flip')
+
+    def game_position(self, pos):
+        """The game_surface pixel under a window position, or None off the frame"""
+        if not self.target.collidepoint(pos):
+            return None
+        return ((pos[0] - self.target.x) * GAME_WIDTH // self.target.width,
+                (pos[1] - self.target.y) * GAME_HEIGHT // self.target.height)
+
+    def cycle_palette(self, step):
+        """Advance the color cycles by re-coloring the frame on screen"""
+        if not self.indexed or step == self.palette_step:
+            return
+        self.palette_step = step
+        palette = palette_at(step)
+        self.index_buffer.set_palette(palette)
+        for _, buffer, _, _ in self.regions.values():
+            buffer.set_palette(palette)
+        self.target_surface.blit(self.index_buffer, (0, 0))
+        pygame.display.update(self.target)
+
+def present(rects, profiler=None):
+    """Put the given game_surface rects on the display"""
+    presenter.present(rects, profiler)
+
+class FrameProfiler:
+    """Per-phase frame timings and draw call counts
+
+    Phases are timed with mark(), which charges the time since the previous
+    mark to the named phase. Scaling writes straight into the screen, so the
+    scale phase also covers what used to be a separate blit. While a
+    profiler exists, pygame.draw functions and the pixel and dither helpers
+    are wrapped to count calls. Closing it restores them, so the game pays
+    nothing when profiling is off.
+    """
+    PHASES = ('events', 'scene', 'ui', 'scale', 'flip')
+    COUNTERS = ('draw', 'set_at', 'dither')
+    HUD_REFRESH = 15
+
+    def __init__(self, log_path=None, window=60):
+        columns = self.PHASES + self.COUNTERS + ('total', 'interval')
+        self.history = {name: deque(maxlen=window) for name in columns}
+        self.current = dict.fromkeys(self.PHASES + self.COUNTERS, 0)
+        self.frame = 0
+        self.frame_start = self.last = None
+        self.hud_lines = ()
+        self.wrapped = []
+
+        self.log = None
+        if log_path:
+            self.log = open(log_path, 'w')
+            self.log_csv = log_path.endswith('.csv')
+            if self.log_csv:
+                self.log.write(','.join(('frame',) + columns) + '\n')
+
+        self._wrap(pygame.draw, ('rect', 'polygon', 'line', 'lines', 'arc',
+                                 'circle', 'ellipse', 'aaline', 'aalines'), 'draw')
+        module = sys.modules[__name__]
+        self._wrap(module, ('draw_pixel',), 'set_at')
+        self._wrap(module, ('draw_dithered_rect',), 'dither')
+
+    def _wrap(self, owner, names, counter):
+        current = self.current
+        for name in names:
+            original = getattr(owner, name)
+
+            def counted(*args, _original=original, **kwargs):
+                current[counter] += 1
+                return _original(*args, **kwargs)
+
+            setattr(owner, name, counted)
+            self.wrapped.append((owner, name, original))
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.history['interval'].append(now - self.frame_start)
+        self.frame_start = self.last = now
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        total = time.perf_counter() - self.frame_start
+        self.history['total'].append(total)
+        for name, value in self.current.items():
+            self.history[name].append(value)
+
+        if self.log:
+            if self.log_csv:
+                values = [self.current[name] for name in self.PHASES + self.COUNTERS]
+                interval = self.history['interval'][-1] if self.history['interval'] else 0
+                self.log.write(','.join(str(value) for value in [self.frame] + values + [total, interval]) + '\n')
+            else:
+                record = dict(self.current, frame=self.frame, total=total)
+                self.log.write(json.dumps(record) + '\n')
+
+        for name in self.current:
+            self.current[name] = 0
+        self.frame += 1
+        if self.frame % self.HUD_REFRESH == 0:
+            self.hud_lines = self.format_hud()
+
+    def average(self, name):
+        values = self.history[name]
+        return sum(values) / len(values) if values else 0
+
+    def format_hud(self):
+        """Rolling averages as short text lines, times in milliseconds"""
+        interval = self.average('interval')
+        ms = {name: self.average(name) * 1000 for name in self.PHASES + ('total',)}
+        return (
+            f"FPS {1 / interval if interval else 0:.1f}  frame {ms['total']:.2f}",
+            f"ev {ms['events']:.2f} sc {ms['scene']:.2f} ui {ms['ui']:.2f}",
+            f"scale {ms['scale']:.2f} flip {ms['flip']:.2f}",
+            f"draw {self.average('draw'):.0f} set_at {self.average('set_at'):.0f} "
+            f"dither {self.average('dither'):.0f}",
+        )
+
+    def close(self):
+        for owner, name, original in reversed(self.wrapped):
+            setattr(owner, name, original)
+        self.wrapped = []
+        if self.log:
+            self.log.close()
+            self.log = None
+
+HUD_RECT = pygame.Rect(0, 0, 140, 45)
+FRAME_REGIONS['hud'] = HUD_RECT
+
+def draw_profiler_hud(surface, profiler):
+    """Draw the profiler's rolling averages in the top left corner"""
+    draw_pixel_rect(surface, 'black', *HUD_RECT)
+    for i, line in enumerate(profiler.hud_lines):
+        surface.blit(render_text(font_small, line, 'light_green'), (2, 1 + i * 11))
+
+def animation_rate(state, showing_title, walker=None):
+    """Redraws per second the current screen needs, 0 if it is static"""
+    if showing_title:
+        return TITLE_RATE
+    if state.flags['game_won']:
+        return 0
+    room = state.current_room
+    rates = [anim.rate for anim in AMBIENT.get(room, ()) if anim.animated()]
+    if walker and walker.path:
+        rates.append(WALK_RATE)
+    if indexed_color and room in CYCLED_ROOMS:
+        rates.append(CYCLE_RATE)
+    return max(rates, default=0)
+
+def next_events(rate, now):
+    """Wait for input, or until the next animation step is due
+
+    A static screen blocks until something happens, so an idle game uses no
+    CPU; input wakes it immediately whatever the rate.
+    """
+    events = pygame.event.get()
+    if events:
+        return events
+    if rate:
+        step_ms = 1000 / rate
+        delay = int(step_ms - now % step_ms) + 1
+        event = pygame.event.wait(delay)
+    else:
+        event = pygame.event.wait()
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+def play_command(state, command, journal=None, autosaver=None):
+    """Run a typed or clicked command, recording it in the journal
+
+    Commands that change the state are autosaved; winning drops the
+    save, as there is nothing left to carry on with.
+    """
+    if journal:
+        write_journal_entry(journal, command)
+    before = state.state_key()
+    state.message = parse_command(command, state)
+    invalidate_scene_cache(state)
+    if autosaver and state.state_key() != before:
+        if state.flags['game_won']:
+            autosaver.discard()
+        else:
+            autosaver.save(state)
+
+def main(profile_log=None, scale_mode='integer', scale=SCALE, upscaler=None, journal_path=None,
+         indexed=False, asset_pack_path=ASSET_PACK_PATH, save_path=None, new_game=False):
+    """Main game loop
+
+    With save_path the game is autosaved there, and carries on from it
+    unless new_game is set or the session is journaled; journaled sessions
+    always start from the beginning so they can be replayed.
+    """
+    global ambient_ticks, asset_pack
+    init_display(scale_mode=scale_mode, scale=scale, upscaler=upscaler, indexed=indexed)
+    asset_pack = load_asset_pack(asset_pack_path) if asset_pack_path else None
     clock = pygame.time.Clock()
-    state = GameState()
+    autosaver = None
+    if save_path:
+        try:
+            autosaver = Autosaver(save_path)
+        except (OSError, ValueError) as e:
+            print(f"{e}; not autosaving", file=sys.stderr)
+    state = None
+    if autosaver and not new_game and not journal_path:
+        state = autosaver.restore()
+    if state is None or state.flags['game_won']:
+        state = GameState()
+    ROOMS.enter(state.current_room)
+    walker = Walker()
+    journal = open_journal(journal_path) if journal_path else None
     input_text = ""
 
     # Title screen
     showing_title = True
     title_timer = 0
+    started = pygame.time.get_ticks()
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # What is currently on screen, None forces a full redraw
+    shown = None
 
-            if event.type == pygame.KEYDOWN:
-                if showing_title:
-                    showing_title = False
-                    continue
+    # F3 toggles the profiler HUD; a log file keeps the profiler running
+    show_hud = False
+    profiler = FrameProfiler(profile_log) if profile_log else None
 
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                elif event.key == pygame.K_RETURN:
-                    if input_text:
-                        state.message = parse_command(input_text, state)
-                        input_text = ""
-                elif event.key == pygame.K_BACKSPACE:
-                    input_text = input_text[:-1]
-                elif event.unicode and len(input_text) < 50:
-                    input_text += event.unicode
-
-        # Clear game surface
-        game_surface.fill(EGA_COLORS['black'])
-
-        if showing_title:
-            # Draw title screen
-            draw_pixel_rect(game_surface, 'black', 0, 0, 320, 200)
-
-            # Lighthouse silhouette
-            draw_pixel_rect(game_surface, 'dark_gray', 135, 60, 50, 100)
-            draw_pixel_rect(game_surface, 'yellow', 150, 50, 20, 15)
-
-            # Light beams
-            title_timer += 1
-            if title_timer % 30 < 15:
-                pygame.draw.line(game_surface, EGA_COLORS['yellow'], (160, 55), (80, 20), 2)
-                pygame.draw.line(game_surface, EGA_COLORS['yellow'], (160, 55), (240, 20), 2)
-
-            # Title text
-            title1 = font_medium.render("THE LIGHTHOUSE", True, EGA_COLORS['light_cyan'])
-            title2 = font_medium.render("OF FORGOTTEN SOULS", True, EGA_COLORS['light_cyan'])
-            game_surface.blit(title1, (95, 10))
-            game_surface.blit(title2, (80, 28))
-
-            # Instructions
-            inst1 = font_small.render("A Sierra-Style Adventure", True, EGA_COLORS['white'])
-            inst2 = font_small.render("Press any key to begin...", True, EGA_COLORS['yellow'])
-            game_surface.blit(inst1, (95, 170))
-            game_surface.blit(inst2, (95, 185))
-
-            # Stars
-            for i in range(30):
-                x = (i * 37 + title_timer) % 320
-                y = (i * 13) % 50
-                game_surface.set_at((x, y), EGA_COLORS['white'])
-
-        elif state.flags['game_won']:
-            draw_win_screen(game_surface, state)
-            draw_ui(game_surface, state, input_text)
-        else:
-            # Draw current scene
-            draw_scene(game_surface, state)
-            draw_ui(game_surface, state, input_text)
+    try:
+        while True:
+            if profiler:
+                # Profiling wants a steady frame rate to measure
+                profiler.begin_frame()
+                events = pygame.event.get()
+            else:
+                rate = animation_rate(state, showing_title, walker)
+                events = next_events(rate, pygame.time.get_ticks())
 
-        # Scale up to screen
-        scaled = pygame.transform.scale(game_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(scaled, (0, 0))
+            for event in events:
+                if event.type == pygame.QUIT:
+                    sys.exit()
 
-        pygame.display.flip()
-        clock.tick(30)
+                if event.type == pygame.VIDEOEXPOSE:
+                    shown = None
+
+                if event.type == pygame.VIDEORESIZE and presenter.mode == 'fit':
+                    presenter.resize()
+                    shown = None
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        show_hud = not show_hud
+                        if show_hud and not profiler:
+                            profiler = FrameProfiler()
+                            profiler.begin_frame()
+                        elif not show_hud and not profile_log:
+                            profiler.close()
+                            profiler = None
+                        continue
+
+                    if event.key == pygame.K_F11:
+                        presenter.toggle_fullscreen()
+                        shown = None
+                        continue
+
+                    if showing_title:
+                        showing_title = False
+                        continue
+
+                    if event.key == pygame.K_ESCAPE:
+                        sys.exit()
+                    elif event.key == pygame.K_RETURN:
+                        if input_text:
+                            play_command(state, input_text, journal, autosaver)
+                            input_text = ""
+                    elif event.key == pygame.K_BACKSPACE:
+                        input_text = input_text[:-1]
+                    elif event.unicode and len(input_text) < 50:
+                        input_text += event.unicode
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                    if showing_title:
+                        showing_title = False
+                        continue
+                    pos = presenter.game_position(event.pos)
+                    if not pos or state.flags['game_won']:
+                        continue
+                    # A left click walks wherever it can; a right click always looks
+                    if event.button == 3 or not walker.click(state, *pos):
+                        clicked = click_command(state, *pos)
+                        if clicked:
+                            play_command(state, clicked, journal, autosaver)
+
+            if profiler:
+                profiler.mark('events')
+
+            # Animations advance with the clock, however often we wake
+            ambient_ticks = pygame.time.get_ticks()
+            if showing_title:
+                title_timer = (ambient_ticks - started) * TITLE_RATE // 1000
+
+            if walker.room != state.current_room:
+                walker.enter(state, walker.room)
+            arrived = walker.update(ambient_ticks)
+            if arrived:
+                play_command(state, arrived, journal, autosaver)
+                if walker.room != state.current_room:
+                    walker.enter(state, walker.room)
+
+            signature = frame_signature(state, input_text, showing_title, title_timer, walker)
+            if show_hud:
+                signature['hud'] = profiler.hud_lines
+            rects = dirty_regions(shown, signature)
+            if rects:
+                # Morgan walking over an unchanged room is redrawn in place,
+                # unless he passes under something drawn over the scene
+                if (only_sprite_moved(shown, signature)
+                        and not rects[0].colliderect(INVENTORY_RECT)
+                        and not (show_hud and rects[0].colliderect(HUD_RECT))
+                        and draw_sprite_step(game_surface, state, walker, rects[0])):
+                    if profiler:
+                        profiler.mark('scene')
+                else:
+                    render_frame(game_surface, state, input_text, showing_title, title_timer, profiler, walker)
+                if show_hud:
+                    draw_profiler_hud(game_surface, profiler)
+                present(rects, profiler)
+                shown = signature
+            if indexed:
+                presenter.cycle_palette(ambient_ticks * CYCLE_RATE // 1000)
+
+            if profiler:
+                profiler.end_frame()
+                clock.tick(30)
+    finally:
+        if profiler:
+            profiler.close()
+        if journal:
+            journal.close()
+        if autosaver:
+            autosaver.close()
+        # However the game ends: window closed, Escape or a quit command
+        pygame.quit()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Lighthouse of Forgotten Souls")
+    parser.add_argument('--profile-log', metavar='FILE',
+                        help="stream per-frame timings to FILE (.csv for CSV, otherwise JSONL)")
+    parser.add_argument('--scale-mode', choices=SCALE_MODES, default='integer',
+                        help="how the 320x200 frame is scaled to the display (F11 toggles fullscreen)")
+    parser.add_argument('--scale', type=int, default=SCALE,
+                        help="window size as a multiple of 320x200 (default %(default)s)")
+    parser.add_argument('--upscaler', choices=UPSCALERS,
+                        help="pixel-art filter applied before scaling")
+    parser.add_argument('--journal', metavar='FILE',
+                        help="record every command to FILE for lighthouse_replay.py")
+    parser.add_argument('--indexed', action='store_true',
+                        help="render in 8-bit EGA palette mode with palette cycling")
+    parser.add_argument('--asset-pack', metavar='FILE', default=ASSET_PACK_PATH,
+                        help="pre-baked pictures from lighthouse_assets.py (default %(default)s)")
+    parser.add_argument('--no-asset-pack', dest='asset_pack', action='store_const', const=None,
+                        help="draw every picture instead of using the asset pack")
+    parser.add_argument('--save', metavar='FILE',
+                        help=f"autosave file, restored at startup (default {SAVE_PATH}, "
+                             "except with --journal or --new-game)")
+    parser.add_argument('--no-save', dest='save', action='store_const', const='',
+                        help="neither restore nor autosave the game")
+    parser.add_argument('--new-game', action='store_true',
+                        help="start from the beginning without touching the autosave, unless --save is given")
+    parser.add_argument('--script', metavar='FILE',
+                        help="run commands from FILE (- for stdin) without a window, streaming the responses")
+    parser.add_argument('--format', choices=('text', 'jsonl'), default='text',
+                        help="--script output: a transcript, or JSON lines with room, flags and inventory")
+    args = parser.parse_args()
+    if args.save is None:
+        # Replaying a journal or starting over mustn't overwrite the player's
+        # own autosave unless they ask for it
+        args.save = None if args.journal or args.new_game else SAVE_PATH
+    if args.script:
+        try:
+            run_script(args.script, args.format, journal_path=args.journal)
+        except (BrokenPipeError, KeyboardInterrupt):
+            pass
+        sys.exit(0)
+
     print("\n" + "="*60)
     print("  THE LIGHTHOUSE OF FORGOTTEN SOULS")
     print("  A Sierra-Style Adventure Game")
@@ -1091,6 +2728,14 @@ if __name__ == "__main__":
     print("\nYou are Morgan, a shipwrecked sailor on a mysterious island.")
     print("Restore the lighthouse and free the trapped souls!")
     print("\nCommands: LOOK, GET, USE, TALK, GO (N/S/E/W), INVENTORY")
-    print("Type LOOK <object> to examine things closely.")
+    print("Type LOOK <object> to examine things closely, or click on them.")
+    print("Click on the ground or a way out to walk there; right-click always looks.")
+    print("Press F3 in game for the frame profiler.")
+    if args.save:
+        print("Your progress is saved as you play; start with --new-game to begin again.")
     print("="*60 + "\n")
-    main()
+
+    main(profile_log=args.profile_log, scale_mode=args.scale_mode,
+         scale=args.scale, upscaler=args.upscaler, journal_path=args.journal,
+         indexed=args.indexed, asset_pack_path=args.asset_pack, save_path=args.save or None,
+         new_game=args.new_game)
@@ -0,0 +1,143 @@
+"""
+Asset pack builder for The Lighthouse of Forgotten Souls
+
+Bakes every room background (one per combination of the items and flags it
+shows, and per ambient animation frame), the win screen and the title art
+into one pack file that the game maps at startup instead of drawing them.
+The pack records hashes of the source and room files it was baked from;
+the game ignores a stale pack, or a stale room's pictures, and draws them
+itself, so rebuild after changing any drawing code or room.
+
+    python lighthouse_assets.py            # build lighthouse_assets.pack
+    python lighthouse_assets.py --check    # exit 1 if the pack is missing, stale or
+                                           # doesn't match drawing in indexed mode
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import lighthouse_adventure as game
+
+def bake():
+    """Draw every picture, returning a list of (name, surface)"""
+    size = (game.GAME_WIDTH, game.GAME_HEIGHT)
+    pictures = []
+
+    # Rooms and the win screen only use palette colors, so one 8-bit copy
+    # serves both display modes
+    game.init_display(headless=True)
+    paletted = pygame.Surface(size, 0, 8)
+    paletted.set_palette(game.palette_at(0))
+    for room, settings in game.render_states():
+        state = game.render_state(room, settings)
+        for ticks in game.ambient_frame_ticks(room):
+            game.ambient_ticks = ticks
+            surface = game.new_surface(size, paletted)
+            game.draw_scene(surface, state)
+            pictures.append((game.scene_asset_name(game.scene_key(state)), surface))
+    game.ambient_ticks = 0
+    surface = game.new_surface(size, paletted)
+    game.draw_win_screen(surface, game.GameState())
+    pictures.append(('win', surface))
+
+    # Title text differs between the modes
+    for indexed in (False, True):
+        game.init_display(headless=True, indexed=indexed)
+        for beams in (False, True):
+            surface = game.new_surface(size, game.game_surface)
+            game.draw_title_art(surface, beams)
+            pictures.append((game.title_asset_name(beams), surface))
+    return pictures
+
+def mismatches(pack):
+    """Names of pictures that don't come out of the pack as drawn, index for index
+
+    Checked in indexed mode, where a blit that remaps colors would fold the
+    cycled palette slots into the plain EGA colors they start as.
+    """
+    game.init_display(headless=True, indexed=True)
+    size = (game.GAME_WIDTH, game.GAME_HEIGHT)
+    different = []
+
+    def compare(name, room, draw):
+        drawn = game.new_surface(size, game.game_surface)
+        draw(drawn)
+        picture = pack.surface(name, room)
+        if picture is None:
+            different.append(name)
+            return
+        baked = game.new_surface(size, game.game_surface)
+        baked.blit(picture, (0, 0))
+        if pygame.image.tobytes(baked, 'P') != pygame.image.tobytes(drawn, 'P'):
+            different.append(name)
+
+    for room, settings in game.render_states():
+        state = game.render_state(room, settings)
+        for ticks in game.ambient_frame_ticks(room):
+            game.ambient_ticks = ticks
+            compare(game.scene_asset_name(game.scene_key(state)), room,
+                    lambda surface: game.draw_scene(surface, state))
+    game.ambient_ticks = 0
+    compare('win', None, lambda surface: game.draw_win_screen(surface, game.GameState()))
+    for beams in (False, True):
+        compare(game.title_asset_name(beams), None, lambda surface: game.draw_title_art(surface, beams))
+    return different
+
+def write_pack(path, pictures):
+    """Write pictures as an asset pack, replacing path atomically"""
+    entries = {}
+    chunks = []
+    offset = 0
+    for name, surface in pictures:
+        fmt = 'P' if surface.get_bitsize() == 8 else 'RGB'
+        pixels = pygame.image.tobytes(surface, fmt)
+        entries[name] = [offset, surface.get_width(), surface.get_height(), fmt]
+        chunks.append(pixels)
+        offset += len(pixels)
+    rooms = {room: game.room_source_hash(room) for room in game.ROOMS}
+    index = json.dumps({'source': game.asset_source_hash(), 'rooms': rooms, 'entries': entries}).encode()
+
+    temp = path + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(game.ASSET_PACK_HEADER.pack(game.ASSET_PACK_MAGIC, len(index)))
+        f.write(index)
+        for pixels in chunks:
+            f.write(pixels)
+    os.replace(temp, path)
+    return offset
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake the game's pictures into an asset pack")
+    parser.add_argument('--out', default=game.ASSET_PACK_PATH, help="pack file (default %(default)s)")
+    parser.add_argument('--check', action='store_true', help="only check that the pack is present and current")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        pack = game.load_asset_pack(args.out)
+        if pack is None:
+            print(f"{args.out} is missing or stale")
+            return 1
+        different = mismatches(pack)
+        if different:
+            print(f"{args.out} differs from the drawn pictures in indexed mode: {', '.join(different)}")
+            return 1
+        print(f"{args.out} is current ({len(pack.entries)} pictures)")
+        return 0
+
+    started = time.perf_counter()
+    pictures = bake()
+    size = write_pack(args.out, pictures)
+    elapsed = time.perf_counter() - started
+    print(f"Baked {len(pictures)} pictures ({size / 1024:.0f} KiB) into {args.out} in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Benchmarks for The Lighthouse of Forgotten Souls
+
+Times every room renderer under each combination of the inventory items and
+flags it reads, the UI overlay, the scale step, the full frame pipeline and
+parse_command over the walkthrough command stream. Everything runs headless,
+so no video device is needed.
+
+    python lighthouse_bench.py                   # run and compare to baseline
+    python lighthouse_bench.py --save-baseline   # record a new baseline
+    python lighthouse_bench.py --filter beach    # only cases matching 'beach'
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import lighthouse_adventure as game
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+def time_case(fn, repeat, warmup=3):
+    """Run fn repeatedly and return its median and p99 time in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'median': samples[len(samples) // 2],
+        'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+def room_states():
+    """Yield (label, state) for every room and render-relevant state combination"""
+    for room, settings in game.render_states():
+        label = ','.join(f"{name}={int(value)}" for name, value in settings)
+        yield f"{room}[{label}]", game.render_state(room, settings)
+
+def build_cases():
+    """Return a list of (name, fn, unit_count) benchmark cases"""
+    surface = game.game_surface
+    scaled = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT), 0, surface)
+    cases = []
+
+    for label, state in room_states():
+        cases.append((f"draw/{label}", lambda state=state: game.draw_scene(surface, state), 1))
+
+    for label, state in room_states():
+        def frame(state=state):
+            # Same work main() does for a frame whose scene is unchanged
+            game.frame_signature(state, "look", False, 0)
+            game.render_frame(surface, state, "look")
+            pygame.transform.scale(surface, scaled.get_size(), scaled)
+
+        def cold_frame(state=state):
+            game.scene_cache.clear()
+            frame(state)
+
+        cases.append((f"frame/{label}", frame, 1))
+        cases.append((f"frame-cold/{label}", cold_frame, 1))
+
+    ui_state = game.GameState()
+    for item in ('driftwood', 'rope', 'apple', 'matches', 'small_key', 'lantern'):
+        ui_state.add_to_inventory(item)
+    cases.append(("ui/draw_ui", lambda: game.draw_ui(surface, ui_state, "look at the crab"), 1))
+    cases.append(("scale/allocate", lambda: pygame.transform.scale(surface, scaled.get_size()), 1))
+    cases.append(("scale/into-buffer", lambda: pygame.transform.scale(surface, scaled.get_size(), scaled), 1))
+
+    commands = game.load_walkthrough()
+
+    def walkthrough():
+        state = game.GameState()
+        for command in commands:
+            game.parse_command(command, state)
+
+    cases.append(("parse/walkthrough", walkthrough, len(commands)))
+    return cases
+
+def load_baseline(path):
+    """Load stored results, or None if there is no baseline yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['cases']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rendering and parsing")
+    parser.add_argument('--repeat', type=int, default=50, help="samples per case")
+    parser.add_argument('--filter', default='', help="only run cases containing this text")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="write results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed median slowdown before a case is flagged (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    game.init_display(headless=True)
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+
+    print(f"{'case':<58} {'median ms':>10} {'p99 ms':>10} {'vs base':>9}")
+    for name, fn, units in build_cases():
+        if args.filter not in name:
+            continue
+        result = time_case(fn, args.repeat)
+        results[name] = result
+
+        change = ''
+        if baseline and name in baseline:
+            ratio = result['median'] / baseline[name]['median'] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.tolerance:
+                change += ' !'
+                regressions.append(name)
+        line = f"{name:<58} {result['median'] * 1000:>10.3f} {result['p99'] * 1000:>10.3f} {change:>9}"
+        if units > 1:
+            line += f"  ({units / result['median']:,.0f} commands/s)"
+        print(line)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'repeat': args.repeat, 'cases': results}, f, indent=1, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    elif baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Golden-image checks for The Lighthouse of Forgotten Souls
+
+Renders every room under every combination of the inventory items and flags
+its scene reads (and every frame of its ambient animations), plus
+the win screen, headless across a process pool. Each image is written as a
+PNG and checked against the stored golden set: a matching hash passes
+straight away, and only mismatches are decoded and diffed pixel by pixel,
+with a diff image written next to the new render. The index records the
+display mode the set was rendered in, and each mode has its own default
+directory; only the RGB set is committed.
+
+    python lighthouse_golden.py --update          # record the golden set
+    python lighthouse_golden.py                   # render and compare
+    python lighthouse_golden.py --filter chamber  # only matching cases
+    python lighthouse_golden.py --indexed --update  # record an 8-bit set locally
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import lighthouse_adventure as game
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIRS = {'rgb': os.path.join(HERE, 'golden'), 'indexed': os.path.join(HERE, 'golden_indexed')}
+OUTPUT_DIR = os.path.join(HERE, 'golden_out')
+INDEX_NAME = 'index.json'
+
+def cases():
+    """List (name, room, settings, ticks) for every image to render"""
+    found = []
+    for room, settings in game.render_states():
+        name = room + ''.join(f".{flag}={int(value)}" for flag, value in settings)
+        if room not in game.AMBIENT:
+            found.append((name, room, settings, 0))
+            continue
+        for frame, ticks in enumerate(game.ambient_frame_ticks(room)):
+            found.append((f"{name}.frame={frame}", room, settings, ticks))
+    found.append(('win', 'win', [], 0))
+    return found
+
+def image_hash(surface):
+    return hashlib.blake2b(pygame.image.tobytes(surface, 'RGB'), digest_size=16).hexdigest()
+
+def init_worker(indexed):
+    game.init_display(headless=True, indexed=indexed)
+
+def render_case(case):
+    """Render one case to game_surface, returning it"""
+    name, room, settings, ticks = case
+    surface = game.game_surface
+    surface.fill(game.EGA_COLORS['black'])
+    game.ambient_ticks = ticks
+    if room == 'win':
+        game.draw_win_screen(surface, game.GameState())
+    else:
+        game.draw_scene(surface, game.render_state(room, settings))
+    return surface
+
+def render_and_save(job):
+    """Worker: render a case, save it as a PNG and return (name, hash)"""
+    case, out_dir = job
+    surface = render_case(case)
+    pygame.image.save(surface, os.path.join(out_dir, case[0] + '.png'))
+    return case[0], image_hash(surface)
+
+def to_rgb(image):
+    """Copy an image into a plain 24-bit surface (no display needed)"""
+    rgb = pygame.Surface(image.get_size(), 0, 24)
+    rgb.blit(image, (0, 0))
+    return rgb
+
+def pixel_diff(new_path, golden_path, diff_path):
+    """Count differing pixels and write a copy of the golden image with them in red"""
+    new = pygame.image.load(new_path)
+    golden = pygame.image.load(golden_path)
+    if new.get_size() != golden.get_size():
+        return -1
+    new, golden = to_rgb(new), to_rgb(golden)
+    # Pixels of new within (1, 1, 1) of golden are set; the rest differ
+    same = pygame.mask.from_threshold(new, (0, 0, 0), (1, 1, 1, 255), golden)
+    same.invert()
+    count = same.count()
+    if count:
+        same.to_surface(golden, setcolor=(255, 0, 0), unsetcolor=None)
+        pygame.image.save(golden, diff_path)
+    return count
+
+def mode_name(indexed):
+    return 'indexed' if indexed else 'rgb'
+
+def load_index(directory):
+    """Return (mode, {name: hash}) from a golden index, or None if there is none"""
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        index = json.load(f)
+    return index['mode'], index['images']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every room state and diff against golden images")
+    parser.add_argument('--update', action='store_true', help="write the renders as the new golden set")
+    parser.add_argument('--filter', default='', help="only cases whose name contains this text")
+    parser.add_argument('--golden', help="golden image directory (default golden/, or golden_indexed/ with --indexed)")
+    parser.add_argument('--out', default=OUTPUT_DIR, help="where renders and diffs are written")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes (default %(default)s)")
+    parser.add_argument('--indexed', action='store_true', help="render in 8-bit palette mode")
+    args = parser.parse_args(argv)
+
+    mode = mode_name(args.indexed)
+    args.golden = args.golden or GOLDEN_DIRS[mode]
+    selected = [case for case in cases() if args.filter in case[0]]
+    out_dir = args.golden if args.update else args.out
+    os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    with multiprocessing.Pool(args.workers, init_worker, (args.indexed,)) as pool:
+        hashes = dict(pool.imap_unordered(render_and_save, [(case, out_dir) for case in selected], chunksize=8))
+    elapsed = time.perf_counter() - started
+
+    if args.update:
+        # A filtered update keeps the rest of a set recorded in the same mode
+        recorded = load_index(out_dir)
+        images = recorded[1] if recorded and recorded[0] == mode else {}
+        images.update(hashes)
+        with open(os.path.join(out_dir, INDEX_NAME), 'w') as f:
+            json.dump({'mode': mode, 'images': images}, f, indent=1, sort_keys=True)
+        print(f"Recorded {len(hashes)} golden image(s) in {out_dir} ({elapsed:.2f}s)")
+        return 0
+
+    recorded = load_index(args.golden)
+    if recorded is None:
+        print(f"No golden images in {args.golden}; run with --update to record them.")
+        return 1
+    golden_mode, golden = recorded
+    if golden_mode != mode:
+        print(f"The golden images in {args.golden} were rendered in {golden_mode} mode, not {mode}; "
+              f"point --golden at images rendered in {mode} mode, or record them with --update.")
+        return 1
+
+    failures = []
+    missing = []
+    for name in sorted(hashes):
+        if name not in golden:
+            missing.append(name)
+        elif hashes[name] != golden[name]:
+            # Only mismatches are decoded and compared pixel by pixel
+            count = pixel_diff(os.path.join(out_dir, name + '.png'),
+                               os.path.join(args.golden, name + '.png'),
+                               os.path.join(out_dir, name + '.diff.png'))
+            failures.append((name, count))
+
+    passed = len(hashes) - len(failures) - len(missing)
+    print(f"{len(hashes)} image(s) rendered in {elapsed:.2f}s: {passed} match, "
+          f"{len(failures)} differ, {len(missing)} without a golden")
+    for name, count in failures:
+        detail = "size changed" if count < 0 else f"{count} pixel(s) differ, see {name}.diff.png"
+        print(f"  {name}: {detail}")
+    for name in missing:
+        print(f"  {name}: no golden image")
+    return 1 if failures or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
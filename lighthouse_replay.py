@@ -0,0 +1,111 @@
+"""
+Deterministic replay for The Lighthouse of Forgotten Souls
+
+Re-runs a session journal (recorded with --journal) through parse_command,
+and optionally the renderers, as fast as it can. Each step prints the
+command, the response and a hash of the resulting state, so two runs can be
+diffed to find exactly where they part ways. Journals are read a line at a
+time, so they can be piped in while still being written.
+
+    python lighthouse_replay.py session.jsonl            # per-step state hashes
+    python lighthouse_replay.py session.jsonl --render   # hash the frames too
+    python lighthouse_replay.py - < session.jsonl        # journal from stdin
+    python lighthouse_replay.py --walkthrough --repeat 5000 --quiet   # throughput test
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import lighthouse_adventure as game
+
+def state_hash(state):
+    """Stable digest of a state, comparable across processes"""
+    return hashlib.blake2b(repr(state.state_key()).encode(), digest_size=8).hexdigest()
+
+def frame_hash(surface):
+    return hashlib.blake2b(pygame.image.tobytes(surface, 'RGB'), digest_size=8).hexdigest()
+
+def replay(commands, render=False):
+    """Run commands against a fresh state, yielding (state, record) per step
+
+    With render, each step also draws the frame the player would have seen
+    and hashes it.
+    """
+    state = game.GameState()
+    for step, command in enumerate(commands, 1):
+        try:
+            state.message = game.parse_command(command, state)
+        except game.QuitGame:
+            yield state, {'step': step, 'command': command, 'response': None, 'state': state_hash(state)}
+            return
+        record = {'step': step, 'command': command, 'response': state.message, 'state': state_hash(state)}
+        if render:
+            game.render_frame(game.game_surface, state, "")
+            record['frame'] = frame_hash(game.game_surface)
+        yield state, record
+
+def open_source(args):
+    """Return the commands of the journal or walkthrough to replay"""
+    if args.walkthrough:
+        return game.load_walkthrough()
+    if args.journal == '-':
+        return game.read_journal(sys.stdin)
+    return game.read_journal(open(args.journal))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session deterministically")
+    parser.add_argument('journal', nargs='?', help="journal file, or - for stdin")
+    parser.add_argument('--walkthrough', action='store_true', help="replay the WALKTHROUGH.txt solution")
+    parser.add_argument('--render', action='store_true', help="also render and hash every step's frame")
+    parser.add_argument('--repeat', type=int, default=1, help="replay this many times and report throughput")
+    parser.add_argument('--quiet', action='store_true', help="only print the summary")
+    args = parser.parse_args(argv)
+    if not args.walkthrough and not args.journal:
+        parser.error("give a journal file or --walkthrough")
+
+    if args.render:
+        game.init_display(headless=True)
+
+    commands = open_source(args)
+    if args.repeat > 1:
+        # Repeats need the whole stream; a single run streams it
+        commands = list(commands)
+
+    steps = 0
+    final = last = None
+    won = False
+    start = time.perf_counter()
+    for run in range(args.repeat):
+        for state, record in replay(commands, args.render):
+            steps += 1
+            if not args.quiet and run == 0:
+                print(json.dumps(record), flush=True)
+            last = record
+        if last is None:
+            print("Nothing to replay", file=sys.stderr)
+            return 1
+        won = state.flags['game_won']
+        if final is not None and last['state'] != final['state']:
+            print(f"Run {run + 1} ended in state {last['state']}, run 1 in {final['state']}", file=sys.stderr)
+            return 1
+        final = last
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.repeat} run(s), {steps} steps in {elapsed:.3f}s "
+          f"({steps / elapsed:,.0f} steps/s, {args.repeat / elapsed:,.0f} runs/s), "
+          f"final state {final['state']}", file=sys.stderr)
+    if args.walkthrough and not won:
+        print("The walkthrough did not win the game", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Multi-session text server for The Lighthouse of Forgotten Souls
+
+Hosts many independent players in one process without the pygame window.
+Every connection gets its own GameState and each line it sends is fed
+through parse_command.
+
+    python lighthouse_server.py --port 4000              # TCP, telnet friendly
+    python lighthouse_server.py --port 4000 --workers 4  # shard over 4 processes
+    python lighthouse_server.py --stdio                  # multiplexed stdin/stdout
+
+In --stdio mode every input line is "<session> <command>" and every reply
+is "<session> <response>", with newlines in the response escaped as \\n,
+so one pipe can drive any number of sessions.
+
+With --save, every session is autosaved to a snapshot file as it plays and
+the file is read back at startup. A --stdio session carries on under its
+id; a TCP player is told their session id on connecting and can send
+"resume <id>" on a later connection to pick up where they left off.
+Sessions nobody has played for --save-expiry days are dropped from it.
+
+With --journal-dir, each session's commands are appended to a journal
+named after its id as they are played, so lighthouse_replay.py can replay
+any session. A resumed session goes on writing to its old journal.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import secrets
+import signal
+import socket
+import sys
+import time
+import urllib.parse
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import lighthouse_adventure as game
+
+MAX_LINE = 1024
+PROMPT = "> "
+MAX_RESUME_FAILURES = 3    # per connection, before it is dropped
+
+def journal_path(directory, session_id):
+    """Where a session's journal lives; ids that won't make a file name are hashed"""
+    name = urllib.parse.quote(session_id, safe='')
+    if len(name) > 200:
+        name = hashlib.blake2b(session_id.encode(), digest_size=16).hexdigest()
+    return os.path.join(directory, name + '.jsonl')
+
+class Session:
+    """One player: their id, game state and when they were last heard from"""
+    __slots__ = ('id', 'state', 'last_seen')
+
+    def __init__(self, session_id, state=None):
+        self.id = session_id
+        self.state = game.GameState() if state is None else state
+        self.last_seen = time.monotonic()
+
+    def handle(self, line, autosaver=None, journal_dir=None):
+        """Run one command, returning the response and whether the player quit
+
+        With an autosaver, commands that change the state are saved, and
+        quitting or winning drops the save. With a journal_dir, every command is
+        journaled first. The journal is opened per command, since
+        thousands of open sessions would otherwise hold thousands of files.
+        """
+        self.last_seen = time.monotonic()
+        if journal_dir:
+            with game.open_journal(journal_path(journal_dir, self.id), append=True) as journal:
+                game.write_journal_entry(journal, line)
+        before = self.state.state_key()
+        try:
+            response = game.parse_command(line, self.state)
+        except game.QuitGame:
+            if autosaver:
+                autosaver.discard(self.id)
+            return "Farewell, sailor.", True
+        if autosaver and self.state.state_key() != before:
+            self.state.message = response
+            if self.state.flags['game_won']:
+                autosaver.discard(self.id)
+            else:
+                autosaver.save(self.state, self.id)
+        return response, False
+
+class GameServer:
+    """Runs sessions over asyncio TCP connections or a multiplexed stdio stream"""
+    def __init__(self, max_sessions=10000, idle_timeout=600, autosaver=None, journal_dir=None):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.autosaver = autosaver
+        self.journal_dir = journal_dir
+        self.sessions = {}
+        self.tasks = set()
+        self.closing = asyncio.Event()
+        self.commands = 0
+
+    # TCP
+
+    async def serve_tcp(self, host, port, reuse_port=False):
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            limit=MAX_LINE, reuse_port=reuse_port, backlog=1024)
+        async with server:
+            reaper = asyncio.create_task(self.reap_idle())
+            await self.closing.wait()
+            # Stop accepting, then let every session say goodbye
+            server.close()
+            reaper.cancel()
+            await self.close_sessions()
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The island is full. Try again later.\n")
+            await self.close_writer(writer)
+            return
+
+        # The id is all that guards a saved game, so it has to be unguessable
+        session = Session(secrets.token_urlsafe(16))
+        self.sessions[task] = (session, writer)
+        self.tasks.add(task)
+        resume_failures = 0
+        try:
+            greeting = session.state.message + "\n"
+            if self.autosaver:
+                greeting += f"(Your session is {session.id}. Send RESUME {session.id} to come back to it later.)\n"
+            await self.send(writer, greeting + PROMPT)
+            while not self.closing.is_set():
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.send(writer, "That's too long to say.\n" + PROMPT)
+                    continue
+                if not line:
+                    break
+                text = line.decode('utf-8', 'replace').strip()
+                verb, _, session_id = text.partition(' ')
+                if self.autosaver and verb.lower() == 'resume':
+                    response, resumed = self.resume(session, session_id.strip())
+                    resume_failures += not resumed
+                    done = resume_failures >= MAX_RESUME_FAILURES
+                    if done:
+                        response += "\nToo many wrong guesses. The mist swallows you."
+                else:
+                    response, done = session.handle(text, self.autosaver, self.journal_dir)
+                self.commands += 1
+                # Waiting for the reply to drain before reading the next line
+                # is the backpressure: a slow reader stops being served
+                await self.send(writer, response + "\n" + ("" if done else PROMPT))
+                if done:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.sessions.pop(task, None)
+            self.tasks.discard(task)
+            await self.close_writer(writer)
+
+    def resume(self, session, session_id):
+        """Swap a connection over to a saved session, returning (reply, whether it worked)"""
+        if any(other.id == session_id for other, _ in self.sessions.values()):
+            return "That session is already being played.", False
+        state = self.autosaver.restore(session_id)
+        if state is None:
+            return "There is no saved session by that name.", False
+        session.id, session.state = session_id, state
+        return "Welcome back.\n" + state.message, True
+
+    async def send(self, writer, text):
+        writer.write(text.replace("\n", "\r\n").encode('utf-8'))
+        await writer.drain()
+
+    async def close_writer(self, writer):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def reap_idle(self):
+        """Disconnect sessions that have been silent for too long"""
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30))
+            cutoff = time.monotonic() - self.idle_timeout
+            for task, (session, writer) in list(self.sessions.items()):
+                if session.last_seen < cutoff:
+                    writer.write(b"\r\nYou drift off to sleep... (idle timeout)\r\n")
+                    task.cancel()
+
+    async def close_sessions(self, timeout=5):
+        for task, (session, writer) in list(self.sessions.items()):
+            writer.write(b"\r\nThe mist rolls in. The server is shutting down.\r\n")
+            task.cancel()
+        if self.tasks:
+            await asyncio.wait(self.tasks, timeout=timeout)
+
+    # Multiplexed stdio
+
+    def serve_stdio(self, infile=sys.stdin, outfile=sys.stdout):
+        """Serve "<session> <command>" lines until EOF
+
+        Plain blocking reads and writes: the pipe itself provides the
+        backpressure, and there is nothing else to wait on.
+        """
+        last_reap = time.monotonic()
+        for line in infile:
+            session_id, _, text = line.strip().partition(' ')
+            if not session_id:
+                continue
+            session = self.sessions.get(session_id)
+            if session is None:
+                if len(self.sessions) >= self.max_sessions:
+                    outfile.write(f"{session_id} The island is full.\n")
+                    continue
+                if len(session_id.encode()) > game.SAVE_ID_MAX:
+                    outfile.write(f"{session_id} That session id is too long.\n")
+                    outfile.flush()
+                    continue
+                state = self.autosaver.restore(session_id) if self.autosaver else None
+                session = self.sessions[session_id] = Session(session_id, state)
+            response, done = session.handle(text, self.autosaver, self.journal_dir)
+            self.commands += 1
+            if done:
+                del self.sessions[session_id]
+            outfile.write(f"{session_id} " + response.replace("\n", "\\n") + "\n")
+            outfile.flush()
+
+            # Reap idle sessions every so often
+            if session.last_seen - last_reap > min(self.idle_timeout, 30):
+                last_reap = session.last_seen
+                cutoff = last_reap - self.idle_timeout
+                for idle_id, idle in list(self.sessions.items()):
+                    if idle.last_seen < cutoff:
+                        del self.sessions[idle_id]
+
+def run(args):
+    """Run one server process until it is signalled to stop"""
+    autosaver = None
+    if args.save:
+        autosaver = game.Autosaver(args.save, expire_after=args.save_expiry * 86400)
+    if args.journal_dir:
+        os.makedirs(args.journal_dir, exist_ok=True)
+    server = GameServer(max_sessions=args.max_sessions, idle_timeout=args.idle_timeout, autosaver=autosaver,
+                        journal_dir=args.journal_dir)
+    try:
+        serve(server, args)
+    finally:
+        if autosaver:
+            autosaver.close()
+    return server
+
+def serve(server, args):
+    if args.stdio:
+        try:
+            server.serve_stdio()
+        except KeyboardInterrupt:
+            sys.stdout.flush()
+        return
+
+    async def serve_until_signalled():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, server.closing.set)
+        await server.serve_tcp(args.host, args.port, reuse_port=args.workers > 1)
+
+    asyncio.run(serve_until_signalled())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the game to many players at once")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4000)
+    parser.add_argument('--stdio', action='store_true', help="serve multiplexed sessions over stdin/stdout")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes sharing the port with SO_REUSEPORT")
+    parser.add_argument('--max-sessions', type=int, default=10000, help="per worker")
+    parser.add_argument('--idle-timeout', type=float, default=600, help="seconds before a silent session is dropped")
+    parser.add_argument('--save', metavar='FILE', help="autosave every session to FILE and restore them at startup")
+    parser.add_argument('--journal-dir', metavar='DIR',
+                        help="append every session's commands to DIR/<session id>.jsonl for lighthouse_replay.py")
+    parser.add_argument('--save-expiry', type=float, default=30, metavar='DAYS',
+                        help="drop saved sessions nobody has played for this long (default %(default)s)")
+    args = parser.parse_args(argv)
+    if args.save and args.workers > 1 and not args.stdio:
+        parser.error("--save needs a single worker, as workers can't share one snapshot file")
+
+    if args.stdio or args.workers <= 1:
+        if not args.stdio:
+            print(f"Serving on {args.host}:{args.port}", file=sys.stderr)
+        run(args)
+        return 0
+
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        parser.error("--workers needs SO_REUSEPORT, which this platform lacks")
+
+    print(f"Serving on {args.host}:{args.port} with {args.workers} workers", file=sys.stderr)
+    workers = [multiprocessing.Process(target=run, args=(args,)) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    def stop(signum, frame):
+        for worker in workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for worker in workers:
+        worker.join()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+State-space explorer for The Lighthouse of Forgotten Souls
+
+Starting from a fresh GameState, applies every verb the parser knows to
+every noun it knows, in every reachable state, breadth first. States are
+deduplicated through a transposition table keyed by a packed state hash,
+and each BFS level is expanded across a process pool. The report covers:
+
+  - the shortest solution
+  - every shortest winning command sequence (commands that lead to the same
+    state are folded into one step)
+  - dead ends: reachable states from which the game can no longer be won
+  - room text (descriptions and examine entries) no command ever shows
+
+    python lighthouse_solver.py                  # report, exit 1 if unwinnable
+    python lighthouse_solver.py --workers 8 --json report.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import lighthouse_adventure as game
+
+ROOM_INDEX = {room: i for i, room in enumerate(game.ROOMS)}
+ROOM_NAMES = tuple(game.ROOMS)
+ITEM_COUNT = len(game.ITEMS)
+FLAG_COUNT = len(game.FLAGS)
+
+def pack_key(key):
+    """Fold a state_key() into one int for the transposition table"""
+    room, inventory, flags, taken = key
+    packed = ROOM_INDEX[room]
+    packed = (packed << FLAG_COUNT) | flags
+    packed = (packed << ITEM_COUNT) | inventory
+    return (packed << ITEM_COUNT) | taken
+
+def unpack_key(packed):
+    item_mask = (1 << ITEM_COUNT) - 1
+    taken = packed & item_mask
+    packed >>= ITEM_COUNT
+    inventory = packed & item_mask
+    packed >>= ITEM_COUNT
+    flags = packed & ((1 << FLAG_COUNT) - 1)
+    return (ROOM_NAMES[packed >> FLAG_COUNT], inventory, flags, taken)
+
+WON = 1 << game.FLAGS.index('game_won')
+
+def is_won(packed):
+    return bool(packed & (WON << 2 * ITEM_COUNT))
+
+def vocabulary(all_aliases=False):
+    """Every command worth trying: each verb alone and with each known noun
+
+    Unless all_aliases is set, only the first verb registered for a handler
+    is combined with nouns; its aliases are still tried on their own, which
+    is where they differ (a bare "n" is a direction, "go n" is the same
+    move as "walk n").
+    """
+    verbs = [verb for verb, handler in game.COMMANDS.items() if handler is not game.do_quit]
+    nouns = {noun.replace('_', ' ') for noun in game.build_noun_index()}
+    nouns.update(game.DIRECTIONS)
+    nouns.update(game.DIRECTIONS.values())
+    for words in game.ROOM_DIRECTIONS.values():
+        nouns.update(words)
+    nouns.add('around')
+    if not all_aliases:
+        firsts = {}
+        for verb in verbs:
+            firsts.setdefault(game.COMMANDS[verb], verb)
+        verbs_with_nouns = list(firsts.values())
+    else:
+        verbs_with_nouns = verbs
+    commands = list(verbs)
+    commands += [f"{verb} {noun}" for verb in verbs_with_nouns for noun in sorted(nouns)]
+    return commands
+
+COMMAND_LIST = vocabulary()
+
+def init_worker(all_aliases):
+    global COMMAND_LIST
+    COMMAND_LIST = vocabulary(all_aliases)
+
+def expand(chunk):
+    """Apply every command to each packed state in chunk
+
+    Returns (transitions, responses): per state, a list of (next state,
+    index of the first command that reaches it), and every distinct
+    response seen, for the room text check.
+    """
+    transitions = []
+    responses = set()
+    state = game.GameState()
+    for packed in chunk:
+        key = unpack_key(packed)
+        seen = {}
+        for index, command in enumerate(COMMAND_LIST):
+            # Reset one state in place; commands only touch these fields
+            state.current_room, state.inventory_bits, state.flag_bits, state.world.taken = key
+            response = game.parse_command(command, state)
+            responses.add(response)
+            target = pack_key(state.state_key())
+            if target != packed and target not in seen:
+                seen[target] = index
+        transitions.append((packed, list(seen.items())))
+    return transitions, responses
+
+def explore(workers, all_aliases=False, chunk_size=32):
+    """Breadth-first search of the whole game, returning the explored graph"""
+    start = pack_key(game.GameState().state_key())
+    parents = {start: None}       # transposition table: state -> (parent, command index)
+    depth = {start: 0}
+    edges = {}                    # state -> [(next state, command index)]
+    responses = set()
+    frontier = [start]
+
+    with multiprocessing.Pool(workers, init_worker, (all_aliases,)) as pool:
+        while frontier:
+            # Won states end the game, so they aren't expanded
+            expandable = [packed for packed in frontier if not is_won(packed)]
+            chunks = [expandable[i:i + chunk_size] for i in range(0, len(expandable), chunk_size)]
+            next_frontier = []
+            for transitions, seen in pool.imap_unordered(expand, chunks):
+                responses |= seen
+                for packed, targets in transitions:
+                    edges[packed] = targets
+                    for target, index in targets:
+                        if target not in parents:
+                            parents[target] = (packed, index)
+                            depth[target] = depth[packed] + 1
+                            next_frontier.append(target)
+            frontier = next_frontier
+
+    return start, parents, depth, edges, responses
+
+def path_to(parents, packed):
+    """Commands along the BFS tree from the start to a state"""
+    commands = []
+    while parents[packed] is not None:
+        packed, index = parents[packed]
+        commands.append(COMMAND_LIST[index])
+    return commands[::-1]
+
+def reverse_edges(edges):
+    reverse = {}
+    for packed, targets in edges.items():
+        for target, _ in targets:
+            reverse.setdefault(target, []).append(packed)
+    return reverse
+
+def shortest_solutions(start, depth, edges, reverse, limit):
+    """Count the shortest winning sequences and list up to limit of them"""
+    wins = [packed for packed in depth if is_won(packed)]
+    if not wins:
+        return 0, []
+    best = min(depth[packed] for packed in wins)
+
+    # Only states that lie on some shortest path to a win are worth walking
+    on_path = {packed for packed in wins if depth[packed] == best}
+    stack = list(on_path)
+    while stack:
+        packed = stack.pop()
+        for parent in reverse.get(packed, ()):
+            if depth[parent] == depth[packed] - 1 and parent not in on_path:
+                on_path.add(parent)
+                stack.append(parent)
+
+    def steps(packed):
+        return [(target, index) for target, index in edges.get(packed, ())
+                if target in on_path and depth[target] == depth[packed] + 1]
+
+    # Paths to a win from each state, deepest states first
+    counts = {}
+    for packed in sorted(on_path, key=depth.get, reverse=True):
+        counts[packed] = 1 if is_won(packed) else sum(counts[target] for target, _ in steps(packed))
+
+    solutions = []
+
+    def walk(packed, commands):
+        if len(solutions) >= limit:
+            return
+        if is_won(packed):
+            solutions.append(commands)
+            return
+        for target, index in steps(packed):
+            walk(target, commands + [COMMAND_LIST[index]])
+
+    walk(start, [])
+    return counts.get(start, 0), solutions
+
+def dead_ends(depth, reverse):
+    """Reachable states from which no winning state can be reached"""
+    can_win = {packed for packed in depth if is_won(packed)}
+    stack = list(can_win)
+    while stack:
+        for parent in reverse.get(stack.pop(), ()):
+            if parent not in can_win:
+                can_win.add(parent)
+                stack.append(parent)
+    return sorted((packed for packed in depth if packed not in can_win), key=depth.get)
+
+def unreachable_text(responses):
+    """Room descriptions and examine entries that no response contains"""
+    missing = []
+    for room_id, room in game.ROOMS.items():
+        texts = [('description', room['description'])]
+        texts += [(f"examine {key}", text) for key, text in room.get('examine', {}).items()]
+        for label, text in texts:
+            if not any(text in response for response in responses):
+                missing.append((room_id, label, text))
+    return missing
+
+def describe(packed):
+    room, inventory, flags, taken = unpack_key(packed)
+    state = game.GameState.from_key((room, inventory, flags, taken))
+    set_flags = [flag for flag in game.FLAGS if state.flags[flag]]
+    return f"{room}; carrying {', '.join(state.inventory) or 'nothing'}; flags {', '.join(set_flags) or 'none'}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Explore every reachable game state")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes (default %(default)s)")
+    parser.add_argument('--all-aliases', action='store_true',
+                        help="combine every verb alias with every noun, not just the first verb per handler")
+    parser.add_argument('--max-solutions', type=int, default=20, help="shortest solutions to list")
+    parser.add_argument('--max-dead-ends', type=int, default=10, help="dead ends to list")
+    parser.add_argument('--json', metavar='FILE', help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+    global COMMAND_LIST
+    COMMAND_LIST = vocabulary(args.all_aliases)
+
+    started = time.perf_counter()
+    start, parents, depth, edges, responses = explore(args.workers, args.all_aliases)
+    elapsed = time.perf_counter() - started
+
+    wins = sorted((packed for packed in depth if is_won(packed)), key=depth.get)
+    reverse = reverse_edges(edges)
+    total, solutions = shortest_solutions(start, depth, edges, reverse, args.max_solutions)
+    stuck = dead_ends(depth, reverse)
+    missing = unreachable_text(responses)
+    transitions = sum(len(targets) for targets in edges.values())
+
+    print(f"{len(depth)} states, {transitions} transitions, depth {max(depth.values())}, "
+          f"{len(COMMAND_LIST)} commands per state, {elapsed:.1f}s with {args.workers} workers")
+    print(f"{len(wins)} winning state(s)")
+
+    if solutions:
+        print(f"\nShortest solution ({len(solutions[0])} commands):")
+        for command in solutions[0]:
+            print(f"  {command}")
+        more = "" if len(solutions) == total else f", first {len(solutions)} shown"
+        print(f"\n{total} shortest winning sequence(s){more}:")
+        for commands in solutions:
+            print("  " + "; ".join(commands))
+    else:
+        print("\nNo solution: the game cannot be won!")
+
+    print(f"\n{len(stuck)} dead-end state(s)")
+    for packed in stuck[:args.max_dead_ends]:
+        print(f"  {describe(packed)}")
+        print(f"    via: {'; '.join(path_to(parents, packed))}")
+
+    print(f"\n{len(missing)} piece(s) of room text never shown")
+    for room_id, label, text in missing:
+        print(f"  {room_id} {label}: {text[:60]}...")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'states': len(depth),
+                'transitions': transitions,
+                'shortest_solution': solutions[0] if solutions else None,
+                'shortest_solution_count': total,
+                'shortest_solutions': solutions,
+                'winning_states': [describe(packed) for packed in wins],
+                'dead_ends': [{'state': describe(packed), 'path': path_to(parents, packed)} for packed in stuck],
+                'unreachable_text': [{'room': room_id, 'text': label} for room_id, label, _ in missing],
+            }, f, indent=1)
+
+    return 0 if solutions else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Shipwreck Beach"""
+
+ROOM = {
+    'name': 'Shipwreck Beach',
+    'description': 'A desolate beach littered with driftwood and ship debris. The skeleton of your ship lies half-buried in sand. To the north, a worn path leads uphill toward a lighthouse. Rocky cliffs stretch east.',
+    'exits': {'north': 'path', 'east': 'cliffs'},
+    'doors': {'north': (160, 124), 'east': (314, 140)},
+    'items': ['driftwood', 'rope'],
+    'examine': {
+        'ship': 'The wreckage of the "Maiden\'s Hope". Your crew... you hope they made it somewhere safe.',
+        'driftwood': 'Weathered wood from countless shipwrecks. One piece looks sturdy enough to use.',
+        'rope': 'A length of good rope, still strong despite the saltwater.',
+        'sand': 'Cold, gray sand. Something glints beneath the surface near the waterline.',
+        'water': 'The sea churns endlessly, gray and unforgiving.'
+    },
+    'scene': (
+        # Sky gradient (dithered)
+        ('dither', 'dark_gray', 'blue', (0, 0, 320, 60)),
+        ('rect', 'dark_gray', (0, 60, 320, 20)),
+        # Sea
+        ('object', 'water', (
+            ('dither', 'blue', 'dark_gray', (0, 80, 320, 30)),
+            ('rect', 'blue', (0, 110, 320, 10)),
+        )),
+        # Beach
+        ('floor', (
+            ('object', 'sand', (
+                ('dither', 'brown', 'yellow', (0, 120, 320, 30)),
+                ('rect', 'brown', (0, 150, 320, 10)),
+            )),
+        )),
+        # Shipwreck
+        ('object', 'ship', (
+            ('rect', 'brown', (180, 125, 60, 25)),
+            ('rect', 'brown', (200, 110, 8, 20)),  # Mast
+            ('polygon', 'light_gray', ((200, 110), (240, 120), (200, 125))),  # Torn sail
+        )),
+        # Driftwood
+        ('object', 'driftwood', (
+            ('if', '!driftwood', (
+                ('rect', 'brown', (50, 140, 25, 5)),
+                ('rect', 'brown', (55, 138, 15, 3)),
+            )),
+        )),
+        # Rope
+        ('object', 'rope', (
+            ('if', '!rope', tuple(('rect', 'yellow', (100 + i*3, 142 + (i%2)*2, 3, 2)) for i in range(8))),
+        )),
+        # Lighthouse in distance
+        ('rect', 'light_gray', (150, 20, 20, 60)),
+        ('rect', 'red', (150, 20, 20, 10)),
+        ('rect', 'dark_gray', (155, 10, 10, 10)),  # Light chamber
+        # Waves
+        ('object', 'water', (
+            *(('arc', 'shimmer', (i, 105, 20, 10), 0, 3.14, 1) for i in range(0, 320, 20)),
+        )),
+        # Mist effect
+        *(('dither', 'light_gray', 'dark_gray', (i, 70 + (i%20), 30, 5)) for i in range(0, 320, 40)),
+    ),
+}
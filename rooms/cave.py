@@ -0,0 +1,65 @@
+"""Sea Cave"""
+
+ROOM = {
+    'name': 'Sea Cave',
+    'description': 'A damp cave filled with the sound of dripping water. Bioluminescent algae casts an eerie blue-green glow. Ancient carvings cover the walls.',
+    'exits': {'south': 'cliffs'},
+    'doors': {'south': (160, 156)},
+    'items': ['crystal_lens', 'ancient_coin'],
+    'examine': {
+        'carvings': 'Spiraling symbols and images of a lighthouse with souls rising from it. One phrase is readable: "LIGHT REUNITES WHAT DARKNESS DIVIDES"',
+        'algae': 'Strange glowing algae. It pulses gently, almost like breathing.',
+        'crystal_lens': 'A perfectly shaped crystal lens, clearly crafted by skilled hands. It must be for the lighthouse!',
+        'ancient_coin': 'An old coin bearing the image of a lighthouse keeper.',
+        'water': 'A small pool of seawater. Something shimmers at the bottom.'
+    },
+    'scene': (
+        # Cave walls
+        ('rect', 'black', (0, 0, 320, 160)),
+        # Bioluminescent glow
+        ('object', 'algae', (
+            ('ambient', 0),
+        )),
+        # Cave walls detail
+        ('dither', 'dark_gray', 'black', (0, 0, 40, 160)),
+        ('dither', 'dark_gray', 'black', (280, 0, 40, 160)),
+        # Ancient carvings
+        ('object', 'carvings', (
+            *(node for y in range(20, 100, 15) for node in (
+                ('rect', 'cyan', (15, y, 20, 2)),
+                ('rect', 'cyan', (285, y, 20, 2)),
+            )),
+        )),
+        # Lighthouse symbol carving
+        ('object', 'carvings', (
+            ('rect', 'light_cyan', (20, 40, 8, 20)),
+            ('rect', 'yellow', (22, 38, 4, 4)),
+        )),
+        # Floor
+        ('floor', (
+            ('dither', 'dark_gray', 'blue', (0, 130, 320, 30)),
+        )),
+        # Water pool
+        ('object', 'water', (
+            ('rect', 'blue', (100, 135, 60, 20)),
+            ('dither', 'light_blue', 'blue', (105, 140, 50, 10)),
+        )),
+        # Crystal lens (if not taken)
+        ('object', 'crystal_lens', (
+            ('if', '!crystal_lens', (
+                ('rect', 'light_cyan', (200, 125, 15, 15)),
+                ('rect', 'white', (205, 130, 5, 5)),
+            )),
+        )),
+        # Ancient coin (if not taken)
+        ('object', 'ancient_coin', (
+            ('if', '!ancient_coin', (
+                ('rect', 'yellow', (250, 140, 8, 8)),
+                ('rect', 'brown', (252, 142, 4, 4)),
+            )),
+        )),
+        # Light rays
+        ('line', 'cyan', (160, 0), (140, 130), 1),
+        ('line', 'cyan', (160, 0), (180, 130), 1),
+    ),
+}
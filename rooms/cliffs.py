@@ -0,0 +1,56 @@
+"""Rocky Cliffs"""
+
+ROOM = {
+    'name': 'Rocky Cliffs',
+    'description': 'Jagged cliffs overlook the churning sea. A narrow ledge leads to a cave entrance, but a large aggressive crab blocks the way. Seagulls cry overhead.',
+    'exits': {'west': 'beach', 'north': 'cave'},
+    'doors': {'west': (154, 107), 'north': (236, 107)},
+    'items': [],
+    'examine': {
+        'crab': 'A massive red crab with claws that could snap bone. It snaps menacingly when you approach the cave.',
+        'cave': 'A dark opening in the cliff face. You can\'t reach it with that crab there.',
+        'ledge': 'A narrow ledge, slippery with sea spray.',
+        'seagulls': 'They wheel and cry, as if warning you of something.'
+    },
+    'scene': (
+        # Sky
+        ('dither', 'dark_gray', 'blue', (0, 0, 320, 50)),
+        # Sea below
+        ('rect', 'blue', (0, 120, 320, 40)),
+        ('dither', 'blue', 'light_blue', (0, 140, 320, 20)),
+        # Cliffs
+        ('rect', 'dark_gray', (0, 50, 320, 70)),
+        ('dither', 'dark_gray', 'brown', (0, 80, 320, 40)),
+        # Cliff details
+        *(('rect', 'brown', (i, 60, 25, 20 + (i % 15))) for i in range(0, 320, 30)),
+        # Cave entrance
+        ('object', 'cave', (
+            ('rect', 'black', (200, 70, 40, 35)),
+            ('rect', 'dark_gray', (195, 65, 50, 8)),  # Cave top
+        )),
+        # Crab (if not moved)
+        ('object', 'crab', (
+            ('if', '!crab_moved', (
+                # Crab body
+                ('rect', 'red', (175, 95, 20, 12)),
+                ('rect', 'light_red', (178, 98, 14, 6)),
+                # Claws
+                ('rect', 'red', (165, 90, 10, 8)),
+                ('rect', 'red', (195, 90, 10, 8)),
+                # Eyes
+                ('rect', 'black', (180, 93, 2, 2)),
+                ('rect', 'black', (188, 93, 2, 2)),
+            )),
+        )),
+        # Ledge
+        ('floor', (
+            ('object', 'ledge', (
+                ('rect', 'brown', (150, 105, 90, 5)),
+            )),
+        )),
+        # Seagulls
+        ('object', 'seagulls', (
+            *(('lines', 'white', ((x-5, y+3), (x, y), (x+5, y+3)), 1) for x, y in [(50, 30), (100, 20), (280, 35)]),
+        )),
+    ),
+}
@@ -0,0 +1,62 @@
+"""Overgrown Garden"""
+
+ROOM = {
+    'name': 'Overgrown Garden',
+    'description': 'What was once a lovely garden is now wild and overgrown. A stone bench sits beneath a gnarled apple tree. An old shed stands nearby, its door hanging open.',
+    'exits': {'west': 'path', 'north': 'shed'},
+    'doors': {'west': (6, 140), 'north': (282, 114)},
+    'items': ['matches', 'apple'],
+    'examine': {
+        'bench': 'Carved with two names: "ELIZA & THOMAS - FOREVER"',
+        'tree': 'A twisted apple tree. A few withered apples still cling to its branches.',
+        'apple': 'A small apple, surprisingly fresh.',
+        'shed': 'A weathered tool shed. The door creaks ominously.',
+        'flowers': 'Flowers long gone wild, but still beautiful in their chaos.'
+    },
+    'scene': (
+        # Sky
+        ('dither', 'dark_gray', 'light_gray', (0, 0, 320, 30)),
+        # Background
+        ('floor', (
+            ('rect', 'green', (0, 30, 320, 130)),
+        )),
+        # Overgrown plants everywhere
+        ('object', 'flowers', (
+            ('ambient', 0),
+        )),
+        # Apple tree
+        ('object', 'tree', (
+            ('rect', 'brown', (200, 60, 15, 50)),  # Trunk
+            ('rect', 'green', (170, 30, 60, 40)),  # Foliage
+            ('rect', 'light_green', (180, 40, 40, 25)),
+        )),
+        # Apples
+        ('object', 'apple', (
+            ('if', '!apple', (
+                ('rect', 'red', (185, 45, 6, 6)),
+            )),
+        )),
+        ('object', 'tree', (
+            ('rect', 'red', (210, 50, 6, 6)),
+        )),
+        # Stone bench
+        ('object', 'bench', (
+            ('rect', 'light_gray', (60, 100, 50, 10)),
+            ('rect', 'dark_gray', (65, 110, 10, 15)),
+            ('rect', 'dark_gray', (95, 110, 10, 15)),
+        )),
+        # Shed
+        ('object', 'shed', (
+            ('rect', 'brown', (260, 60, 50, 50)),
+            ('rect', 'dark_gray', (260, 50, 50, 15)),  # Roof
+            ('rect', 'black', (275, 80, 15, 30)),  # Door
+        )),
+        # Matches on ground
+        ('object', 'matches', (
+            ('if', '!matches', (
+                ('rect', 'red', (120, 120, 10, 4)),
+                ('rect', 'brown', (122, 121, 6, 2)),
+            )),
+        )),
+    ),
+}
@@ -0,0 +1,71 @@
+"""Light Chamber"""
+
+ROOM = {
+    'name': 'Light Chamber',
+    'description': 'The top of the lighthouse. A massive Fresnel lens housing stands in the center, but the main lens is missing. Mirrors surround the chamber to amplify the light. One mirror bracket is empty.',
+    'exits': {'down': 'lighthouse_stairs'},
+    'doors': {'down': (160, 156)},
+    'items': [],
+    'examine': {
+        'lens_housing': 'The great lens housing. A crystal lens would fit perfectly in the center mount.',
+        'mirrors': 'Arrangement of mirrors to cast the light far across the sea. One bracket is empty.',
+        'bracket': 'An empty bracket where a mirror should be.',
+        'view': 'From here you can see the entire island... and countless ghostly ships on the horizon, waiting.',
+        'mechanism': 'The turning mechanism for the light. It seems functional if only there was light.'
+    },
+    'scene': (
+        # Glass walls (view outside)
+        ('object', 'view', (
+            ('dither', 'light_blue', 'blue', (0, 0, 320, 100)),
+            # Distant sea and ghost ships
+            ('rect', 'blue', (0, 70, 320, 30)),
+            # Ghost ships on horizon
+            *(('dither', 'light_gray', 'light_blue', (x, 60, 20, 15)) for x in [30, 100, 200, 280]),
+        )),
+        # Floor
+        ('floor', (
+            ('rect', 'dark_gray', (0, 100, 320, 60)),
+            ('dither', 'dark_gray', 'brown', (0, 120, 320, 40)),
+        )),
+        # Lens housing (center)
+        ('object', 'lens_housing', (
+            ('rect', 'dark_gray', (130, 80, 60, 50)),
+            ('rect', 'brown', (135, 85, 50, 40)),
+            # Lens spot
+            ('if', 'lens_installed', (
+                ('rect', 'light_cyan', (150, 95, 20, 20)),
+                ('rect', 'white', (155, 100, 10, 10)),
+                ('if', 'lighthouse_lit', (
+                    # Glowing!
+                    ('rect', 'yellow', (145, 90, 30, 30)),
+                    ('rect', 'white', (155, 100, 10, 10)),
+                )),
+            ), (
+                ('rect', 'black', (150, 95, 20, 20)),
+            )),
+        )),
+        # Mirror brackets
+        ('object', 'mirrors', (
+            ('rect', 'dark_gray', (60, 90, 20, 25)),
+        )),
+        ('object', 'bracket', (
+            ('rect', 'dark_gray', (240, 90, 20, 25)),
+        )),
+        # Left mirror (always there)
+        ('object', 'mirrors', (
+            ('rect', 'light_cyan', (63, 93, 14, 19)),
+        )),
+        # Right mirror (player must place)
+        ('object', 'bracket', (
+            ('if', 'mirror_placed', (
+                ('rect', 'light_cyan', (243, 93, 14, 19)),
+            ), (
+                ('rect', 'black', (243, 93, 14, 19)),
+            )),
+        )),
+        # Frame/ceiling
+        ('rect', 'brown', (0, 0, 320, 10)),
+        ('rect', 'dark_gray', (0, 0, 10, 100)),
+        ('rect', 'dark_gray', (310, 0, 10, 100)),
+    ),
+}
@@ -0,0 +1,62 @@
+"""Lighthouse Base"""
+
+ROOM = {
+    'name': 'Lighthouse Base',
+    'description': 'You stand before the imposing lighthouse. Its white-washed walls are cracked and weathered. A heavy iron door blocks the entrance. A bronze bell hangs in a small tower nearby.',
+    'exits': {'south': 'path', 'north': 'lighthouse_interior'},
+    'doors': {'south': (160, 156), 'north': (160, 128)},
+    'items': [],
+    'examine': {
+        'door': 'A heavy iron door, locked tight. There\'s a small keyhole.',
+        'lighthouse': 'The lighthouse rises high above, its dark windows like hollow eyes. The light chamber at the top is dark.',
+        'bell': 'An old bronze bell, green with patina. A pull rope dangles from it.',
+        'walls': 'Cracks spider across the walls. Names and dates are carved here - lighthouse keepers of old.'
+    },
+    'scene': (
+        # Sky
+        ('dither', 'dark_gray', 'blue', (0, 0, 320, 50)),
+        # Ground
+        ('floor', (
+            ('rect', 'green', (0, 120, 320, 40)),
+            ('dither', 'green', 'brown', (0, 140, 320, 20)),
+        )),
+        # Lighthouse
+        ('object', 'lighthouse', (
+            ('rect', 'light_gray', (120, 20, 80, 100)),
+            ('rect', 'white', (130, 30, 60, 80)),
+            # Red stripes
+            *(('rect', 'red', (130, y, 60, 8)) for y in range(30, 110, 20)),
+            # Light chamber
+            ('rect', 'dark_gray', (135, 10, 50, 15)),
+            ('rect', 'black', (140, 12, 40, 10)),
+            # If lighthouse is lit, show light!
+            ('if', 'lighthouse_lit', (
+                ('rect', 'yellow', (145, 13, 30, 8)),
+                # Light beams
+                ('polygon', 'beam', ((160, 15), (0, 0), (0, 30))),
+                ('polygon', 'beam', ((160, 15), (320, 0), (320, 30))),
+            )),
+        )),
+        # Door
+        ('object', 'door', (
+            ('if', 'lighthouse_door_open', (
+                ('rect', 'black', (145, 90, 30, 35)),
+            ), (
+                ('rect', 'dark_gray', (145, 90, 30, 35)),
+                ('rect', 'brown', (148, 93, 24, 29)),
+                ('rect', 'yellow', (165, 108, 4, 4)),  # Keyhole
+            )),
+        )),
+        # Bell tower
+        ('object', 'bell', (
+            ('rect', 'brown', (50, 80, 30, 40)),
+            ('rect', 'brown', (45, 75, 40, 8)),  # Roof
+            ('rect', 'yellow', (58, 90, 14, 16)),  # Bell
+            ('rect', 'brown', (64, 106, 2, 15)),  # Rope
+        )),
+        # Path
+        ('floor', (
+            ('rect', 'brown', (140, 120, 40, 40)),
+        )),
+    ),
+}
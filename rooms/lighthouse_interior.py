@@ -0,0 +1,62 @@
+"""Lighthouse Interior"""
+
+ROOM = {
+    'name': 'Lighthouse Interior',
+    'description': 'The ground floor of the lighthouse. A spiral staircase winds upward into darkness. An old desk holds a dusty journal. A lantern hangs on a hook by the stairs.',
+    'exits': {'south': 'lighthouse_exterior', 'up': 'lighthouse_stairs'},
+    'doors': {'south': (160, 156), 'up': (230, 144)},
+    'items': ['lantern', 'journal'],
+    'examine': {
+        'staircase': 'Iron stairs spiral upward. They look sturdy enough.',
+        'desk': 'An old keeper\'s desk. A journal lies open upon it.',
+        'journal': 'The journal of Thomas Blackwood, lighthouse keeper. The final entry reads: "The storm took my Eliza. I will keep the light burning until she returns. I will wait forever if I must."',
+        'lantern': 'An old brass lantern. It needs oil to work.',
+        'photographs': 'Faded photographs on the wall show a happy couple - the keeper and his wife.'
+    },
+    'scene': (
+        # Walls
+        ('rect', 'light_gray', (0, 0, 320, 160)),
+        ('dither', 'light_gray', 'white', (20, 10, 280, 140)),
+        # Floor
+        ('floor', (
+            ('rect', 'brown', (0, 140, 320, 20)),
+        )),
+        # Spiral staircase
+        ('object', 'staircase', (
+            ('rect', 'dark_gray', (200, 40, 60, 100)),
+            *(('rect', 'brown', (205, y, 50, 8)) for y in range(50, 130, 15)),
+            ('rect', 'black', (200, 30, 60, 15)),  # Opening above
+        )),
+        # Desk
+        ('object', 'desk', (
+            ('rect', 'brown', (40, 100, 80, 10)),
+            ('rect', 'brown', (50, 110, 10, 30)),
+            ('rect', 'brown', (100, 110, 10, 30)),
+        )),
+        # Journal on desk
+        ('object', 'journal', (
+            ('if', '!journal', (
+                ('rect', 'light_gray', (60, 92, 20, 12)),
+                ('rect', 'brown', (62, 94, 16, 8)),
+            )),
+        )),
+        # Lantern hook
+        ('rect', 'dark_gray', (180, 60, 3, 20)),
+        ('object', 'lantern', (
+            ('if', '!lantern', (
+                ('rect', 'yellow', (175, 75, 12, 15)),
+                ('rect', 'dark_gray', (178, 72, 6, 5)),
+            )),
+        )),
+        # Photos on wall
+        ('object', 'photographs', (
+            ('rect', 'brown', (50, 50, 25, 20)),
+            ('rect', 'light_gray', (52, 52, 21, 16)),
+            ('rect', 'brown', (90, 50, 25, 20)),
+            ('rect', 'light_gray', (92, 52, 21, 16)),
+        )),
+        # Door to outside
+        ('rect', 'brown', (145, 100, 30, 50)),
+        ('rect', 'light_gray', (150, 110, 20, 35)),
+    ),
+}
@@ -0,0 +1,44 @@
+"""Spiral Staircase"""
+
+import math
+
+ROOM = {
+    'name': 'Spiral Staircase',
+    'description': 'You climb the winding stairs. Windows offer glimpses of the island below. The steps groan under your weight. Almost to the top...',
+    'exits': {'down': 'lighthouse_interior', 'up': 'light_chamber'},
+    'doors': {'down': (140, 140), 'up': (140, 58)},
+    'items': [],
+    'examine': {
+        'windows': 'Small windows look out over the island. You can see the beach where you washed ashore.',
+        'stairs': 'Iron stairs, rusty but holding.',
+        'walls': 'More names carved here. Keepers marking their time.'
+    },
+    'scene': (
+        # Dark interior
+        ('rect', 'dark_gray', (0, 0, 320, 160)),
+        # Curved wall effect
+        ('object', 'walls', (
+            ('dither', 'dark_gray', 'light_gray', (0, 0, 60, 160)),
+            ('dither', 'dark_gray', 'light_gray', (260, 0, 60, 160)),
+        )),
+        # Stairs
+        ('floor', (
+            ('object', 'stairs', (
+                *(node for i, y in enumerate(range(130, 30, -20)) for node in (
+                    ('rect', 'brown', (int(100 + 30 * math.sin(i * 0.8)), y, 80, 12)),
+                    ('rect', 'dark_gray', (int(100 + 30 * math.sin(i * 0.8)), y-3, 80, 4)),
+                )),
+            )),
+        )),
+        # Railing
+        ('rect', 'dark_gray', (90, 30, 5, 120)),
+        # Window
+        ('object', 'windows', (
+            ('rect', 'light_gray', (270, 60, 30, 40)),
+            ('rect', 'light_blue', (275, 65, 20, 30)),
+            ('rect', 'dark_gray', (284, 65, 2, 30)),
+        )),
+        # Light from above
+        ('polygon', 'light_gray', ((160, 0), (120, 30), (200, 30))),
+    ),
+}
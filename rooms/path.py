@@ -0,0 +1,59 @@
+"""Winding Path"""
+
+ROOM = {
+    'name': 'Winding Path',
+    'description': 'A weathered stone path winds up the hillside. Wild roses grow alongside, their sweet scent mixing with sea salt. A ghostly figure stands near a crumbling well.',
+    'exits': {'south': 'beach', 'north': 'lighthouse_exterior', 'east': 'garden'},
+    'doors': {'south': (160, 156), 'north': (160, 86), 'east': (314, 130)},
+    'items': [],
+    'examine': {
+        'ghost': 'A translucent woman in old-fashioned dress. She gazes toward the lighthouse with profound sadness.',
+        'well': 'An old stone well. A rusty bucket hangs from a frayed rope. You hear water far below.',
+        'roses': 'Beautiful wild roses. Their thorns are sharp.',
+        'path': 'Worn smooth by countless footsteps over the centuries.'
+    },
+    'scene': (
+        # Sky
+        ('dither', 'dark_gray', 'light_gray', (0, 0, 320, 40)),
+        # Hills
+        ('floor', (
+            ('rect', 'green', (0, 40, 320, 120)),
+            ('dither', 'green', 'light_green', (0, 60, 320, 40)),
+        )),
+        # Path
+        ('floor', (
+            ('object', 'path', (
+                ('polygon', 'brown', ((140, 160), (180, 160), (170, 80), (150, 80))),
+                ('polygon', 'yellow', ((145, 160), (175, 160), (168, 85), (152, 85))),
+            )),
+        )),
+        # Well
+        ('object', 'well', (
+            ('rect', 'dark_gray', (230, 90, 30, 25)),
+            ('rect', 'black', (235, 95, 20, 15)),
+            ('rect', 'brown', (230, 85, 30, 8)),  # Well roof
+            ('rect', 'brown', (243, 70, 4, 15)),  # Post
+        )),
+        # Roses
+        ('object', 'roses', (
+            *(node for x in [80, 95, 110, 200, 210] for node in (
+                ('rect', 'green', (x, 100, 4, 15)),
+                ('rect', 'light_red', (x-2, 95, 8, 8)),
+            )),
+        )),
+        # Ghost
+        ('object', 'ghost', (
+            # Ghostly glow
+            ('dither', 'light_cyan', 'green', (185, 65, 30, 50)),
+            # Ghost figure
+            ('rect', 'light_cyan', (190, 70, 20, 35)),
+            ('rect', 'white', (192, 72, 16, 25)),
+            # Face
+            ('rect', 'light_blue', (195, 75, 3, 3)),
+            ('rect', 'light_blue', (202, 75, 3, 3)),
+        )),
+        # Lighthouse in distance
+        ('rect', 'light_gray', (150, 10, 20, 35)),
+        ('rect', 'red', (150, 10, 20, 8)),
+    ),
+}
@@ -0,0 +1,60 @@
+"""Garden Shed"""
+
+ROOM = {
+    'name': 'Garden Shed',
+    'description': 'A dusty shed filled with old tools and forgotten things. Cobwebs drape everything. A workbench holds various items.',
+    'exits': {'south': 'garden'},
+    'doors': {'south': (160, 154)},
+    'items': ['oil_can', 'small_key'],
+    'examine': {
+        'tools': 'Rusty gardening tools hang on the wall.',
+        'workbench': 'A sturdy workbench. An oil can and a small key rest on its surface.',
+        'oil_can': 'A can of lamp oil, still half full after all these years.',
+        'small_key': 'A small brass key with a lighthouse emblem.',
+        'cobwebs': 'Thick cobwebs everywhere. This place hasn\'t been used in ages.'
+    },
+    'scene': (
+        # Walls
+        ('rect', 'brown', (0, 0, 320, 160)),
+        ('dither', 'brown', 'dark_gray', (0, 0, 320, 160)),
+        # Floor
+        ('floor', (
+            ('rect', 'dark_gray', (0, 130, 320, 30)),
+        )),
+        # Workbench
+        ('object', 'workbench', (
+            ('rect', 'brown', (80, 90, 160, 10)),
+            ('rect', 'brown', (90, 100, 10, 40)),
+            ('rect', 'brown', (220, 100, 10, 40)),
+        )),
+        # Tools on wall
+        ('object', 'tools', (
+            ('rect', 'dark_gray', (50, 40, 5, 40)),  # Shovel
+            ('rect', 'brown', (48, 35, 9, 8)),
+            ('rect', 'dark_gray', (70, 50, 3, 30)),  # Rake
+            ('rect', 'brown', (65, 45, 13, 5)),
+        )),
+        # Oil can (if not taken)
+        ('object', 'oil_can', (
+            ('if', '!oil_can', (
+                ('rect', 'dark_gray', (120, 80, 15, 12)),
+                ('rect', 'yellow', (130, 75, 8, 8)),  # Spout
+            )),
+        )),
+        # Small key (if not taken)
+        ('object', 'small_key', (
+            ('if', '!small_key', (
+                ('rect', 'yellow', (180, 85, 12, 5)),
+                ('rect', 'yellow', (175, 83, 8, 8)),
+            )),
+        )),
+        # Cobwebs
+        ('object', 'cobwebs', (
+            ('lines', 'light_gray', ((0, 0), (40, 30), (20, 50), (50, 40)), 1),
+            ('lines', 'light_gray', ((320, 0), (280, 30), (300, 50), (270, 40)), 1),
+        )),
+        # Door (exit)
+        ('rect', 'light_gray', (145, 100, 30, 50)),
+        ('rect', 'green', (150, 110, 20, 35)),  # Light from outside
+    ),
+}